@@ -2,11 +2,49 @@
 Connect Four  AI Player Module
 """
 
+import cProfile
+import json
+import logging
+import os
 import time
-from player import Player
+from collections import namedtuple
+from .board import ROW_COUNT, COLUMN_COUNT, cell_column, window_score
+from .parallel_search import RootSearchPool, LazySMPPool
+from .player import Player
+from .search_limits import SearchAborted
+from .search_stats import SearchStats
+from .solver import Solver
+from .transposition_table import (
+    TranspositionTable, SharedTranspositionTable, DEFAULT_TABLE_SIZE, EXACT, LOWER_BOUND,
+    UPPER_BOUND)
 
+# Score of a win, increased by the number of cells left empty so that quicker wins
+# score higher. It does not depend on the search root, so table entries stay valid.
+WIN_SCORE = 3000
 
-class AIPlayer(Player):
+# Zobrist key mixed into the position hash when the AI (maximizing player) is to move
+MAXIMIZING_KEY = 0x9E3779B97F4A7C15
+
+# Positions with at most this many empty cells are solved exactly instead of searched
+DEFAULT_SOLVER_THRESHOLD = 16
+
+DEFAULT_TIME_LIMIT = 3  # seconds
+MAX_TIME_LIMIT = 10  # seconds, the longest a move may take whatever the caller asks
+DEFAULT_START_DEPTH = 3  # Initial depth for iterative deepening search
+# The search checks its deadline once per this many nodes
+DEADLINE_CHECK_INTERVAL = 1024
+
+# The move chosen by get_best_move, the deepest completed search depth, the number of
+# nodes searched, the time taken in seconds and the SearchStats of the search
+SearchResult = namedtuple("SearchResult", ["move", "depth", "nodes", "elapsed", "stats"])
+
+LOGGER = logging.getLogger(__name__)
+
+# Environment variable naming a directory to write a profile of every move to
+PROFILE_DIR_VARIABLE = "CONNECT_FOUR_PROFILE_DIR"
+
+
+class AIPlayer(Player):  # pylint: disable=too-many-instance-attributes
     """
     Represents an AI player in the Connect Four game.
 
@@ -14,56 +52,383 @@ class AIPlayer(Player):
         Player (class): The parent class of the AIPlayer class. 
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, table_size=DEFAULT_TABLE_SIZE, keep_table_between_games=False,
+                 opening_book=None, solver_threshold=DEFAULT_SOLVER_THRESHOLD, processes=None,
+                 split_replies=False, threads=None, log_stats=False, profile_dir=None,
+                 **kwargs):
+        """
+        Initialize an AI player.
+
+        Args:
+            table_size (int, optional): The number of transposition table slots.
+            keep_table_between_games (bool, optional): Whether new_game keeps the
+            transposition table of the previous games. Defaults to False.
+            opening_book (OpeningBook, optional): The opening book to answer early
+            positions from without searching. Defaults to None.
+            solver_threshold (int, optional): The number of empty cells at or below which
+            the endgame solver is used. Defaults to DEFAULT_SOLVER_THRESHOLD.
+            processes (int, optional): The number of worker processes to split the root
+            moves across. The pool is started once and reused for every move. Defaults
+            to None, which searches in this process.
+            split_replies (bool, optional): Whether the workers also split the replies to
+            the root moves between them. Defaults to False.
+            threads (int, optional): The number of processes of a lazy SMP search, which
+            all search the same position and share one transposition table in shared
+            memory. Can not be combined with processes. Defaults to None, which searches
+            in this process only.
+            log_stats (bool, optional): Whether to log the statistics of every move as a
+            structured record. Defaults to False.
+            profile_dir (str, optional): A directory to write a cProfile profile of every
+            move to. Defaults to the directory in the CONNECT_FOUR_PROFILE_DIR environment
+            variable, and to no profiling if it is not set.
+
+        Raises:
+            ValueError: If both processes and threads are given.
+        """
         super().__init__(*args, **kwargs)
-        self.cache = {}
+        if processes and threads:
+            raise ValueError("processes and threads can not be used together")
+        self.transposition_table = TranspositionTable(table_size)
+        self.keep_table_between_games = keep_table_between_games
+        self.opening_book = opening_book
+        self.solver = Solver(node_callback=self.count_node)
+        self.solver_threshold = solver_threshold
+        self.last_solution = None  # Proven score and node count of the latest solved move
+        self.game_count = 0  # Tells the workers of the search pool when to clear their tables
+        self.node_count = 0
+        self.deadline = float("inf")  # Time after which the search is abandoned
+        self.node_limit = float("inf")  # Node count after which the search is abandoned
+        self.cancel_event = None  # Event that cancels the search when set
+        self.last_result = None  # SearchResult of the latest move
+        self.stats = SearchStats()  # Statistics of the current or latest search
+        self.log_stats = log_stats
+        self.killer_moves = None  # Two latest cutoff moves by the number of moves made
+        self.history = None  # Cutoff scores by chip, column and row
+        self.clear_move_ordering()
+        self.profile_dir = profile_dir or os.environ.get(PROFILE_DIR_VARIABLE) or None
+        self.ponder_answers = {}  # SearchResults of pondered positions by position key
+        self.search_pool = None
+        if processes:
+            self.search_pool = RootSearchPool(
+                processes, AIPlayer, table_size, split_replies=split_replies)
+        self.smp_pool = None
+        if threads and threads > 1:
+            self.transposition_table = SharedTranspositionTable(table_size)
+            self.smp_pool = LazySMPPool(threads - 1, AIPlayer, self.transposition_table)
+
+    def new_game(self):
+        """
+        Prepare the AI player for a new game. The transposition table is cleared
+        unless it is kept between games.
+        """
+        self.ponder_answers = {}
+        if not self.keep_table_between_games:
+            self.transposition_table.clear()
+            self.game_count += 1
 
-    def get_best_move(self, board, total_moves):
+    def close(self):
+        """
+        Stop the worker processes of the search pools, if there are any, and free the
+        shared transposition table.
+        """
+        if self.search_pool is not None:
+            self.search_pool.close()
+            self.search_pool = None
+        if self.smp_pool is not None:
+            self.smp_pool.close()
+            self.smp_pool = None
+            self.transposition_table.close()
+            self.transposition_table = TranspositionTable(self.transposition_table.size)
+
+    def get_best_move(self, board, total_moves, time_limit=DEFAULT_TIME_LIMIT,
+                      start_depth=DEFAULT_START_DEPTH, max_depth=None, node_budget=None):
         """
         Determine the best move to make for the AI player on the given game board.
 
+        By default the search deepens iteratively until the time limit. An iteration
+        still running at the time limit is abandoned, and the move of the last completed
+        iteration is returned. With a fixed depth or a node budget the time is not
+        looked at, so the same position and table always give the same move and node
+        count. The move, depth, node count, time taken and search statistics are kept in
+        `last_result`, and the statistics are logged if `log_stats` is set.
+        A position answered by `ponder` beforehand is not searched again. If
+        `profile_dir` is set, the move is profiled and the profile is written to a file
+        named after the move number and the position key.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            total_moves (int): The total number of moves made in the game so far.
+            time_limit (float, optional): The time in seconds the search may take, at most
+            MAX_TIME_LIMIT. Defaults to DEFAULT_TIME_LIMIT.
+            start_depth (int, optional): The depth of the first iteration. Defaults to
+            DEFAULT_START_DEPTH.
+            max_depth (int, optional): The depth to search to instead of searching until
+            the time limit. Defaults to None.
+            node_budget (int, optional): The number of nodes the search may visit instead
+            of searching until the time limit. Defaults to None.
+
+        Returns:
+            int: The column number representing the best move for the AI player to make.
+
+        Raises:
+            ValueError: If a node budget is given to a player with worker processes.
+        """
+        if self.profile_dir is None:
+            return self.search_best_move(
+                board, total_moves, time_limit, start_depth, max_depth, node_budget)
+        path = os.path.join(
+            self.profile_dir, f"move_{total_moves:02d}_{board.position_key():013x}.prof")
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(
+                self.search_best_move, board, total_moves, time_limit, start_depth,
+                max_depth, node_budget)
+        finally:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(path)
+
+    def search_best_move(self, board, total_moves, time_limit, start_depth, max_depth,
+                         node_budget):
+        """
+        Determine the best move as described in `get_best_move`, without profiling.
+
         Args:
             board (Board): An instance of the game board representing the current game state.
             total_moves (int): The total number of moves made in the game so far.
+            time_limit (float): The time in seconds the search may take.
+            start_depth (int): The depth of the first iteration.
+            max_depth (int): The depth to search to, or None.
+            node_budget (int): The number of nodes the search may visit, or None.
 
         Returns:
             int: The column number representing the best move for the AI player to make.
+
+        Raises:
+            ValueError: If a node budget is given to a player with worker processes.
         """
-        self.cache = {}  # Clear cache for each new move
+        if node_budget is not None and (self.search_pool or self.smp_pool):
+            raise ValueError("A node budget needs a search in a single process")
+        pondered = self.ponder_answers.get(board.position_key())
+        self.ponder_answers = {}  # The other answers are for positions not reached
+        if pondered is not None:
+            self.last_result = pondered
+            self.stats = pondered.stats
+            return pondered.move
+
+        self.stats = SearchStats()
+        time_start = time.time()
+        node_start = self.searched_node_count()
+
+        self.node_limit = float("inf") if node_budget is None else node_start + node_budget
+        if max_depth is None and node_budget is None:
+            self.deadline = time_start + min(time_limit, MAX_TIME_LIMIT)
+        try:
+            best_move, depth = self.choose_move(board, total_moves, start_depth, max_depth)
+        finally:
+            self.deadline = self.node_limit = float("inf")
+            if self.smp_pool is not None:
+                self.smp_pool.stop()
+
+        self.stats.depth = depth
+        self.stats.nodes = self.searched_node_count() - node_start
+        self.stats.elapsed = time.time() - time_start
+        self.last_result = SearchResult(
+            best_move, depth, self.stats.nodes, self.stats.elapsed, self.stats)
+        if self.log_stats:
+            stats = self.stats.as_dict()
+            LOGGER.info("search %s", json.dumps({"move": best_move, **stats}),
+                        extra={"search_stats": stats})
+        return best_move
+
+    def searched_node_count(self):
+        """
+        Get the number of nodes searched so far by this player and the workers of its
+        search pool.
+
+        Returns:
+            int: The number of nodes searched.
+        """
+        return self.node_count + (self.search_pool.node_count if self.search_pool else 0)
+
+    def ponder(self, board, total_moves, **limits):
+        """
+        Search the answers to the opponent's possible moves while the opponent is
+        thinking, the center columns first. The answers are kept until the next call of
+        get_best_move, which returns the answer to the move the opponent made at once.
+        Pondering stops when the cancel event is set.
+
+        Args:
+            board (Board): An instance of the game board with the opponent to move.
+            total_moves (int): The total number of moves made in the game so far.
+            limits: Keyword arguments passed on to get_best_move for every answer.
+        """
+        self.ponder_answers = {}
+        answers = {}
+        for column in [3, 2, 4, 1, 5, 0, 6]:
+            if not board.is_valid_location(column):
+                continue
+            last_row = board.play(column, 1)
+            if not board.is_winner(last_row, column, 1) and total_moves + 1 < 42:
+                key = board.position_key()
+                self.get_best_move(board, total_moves + 1, **limits)
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    board.undo()
+                    break  # The answer of an abandoned search can not be trusted
+                answers[key] = self.last_result
+            board.undo()
+        self.ponder_answers = answers
+
+    def choose_move(self, board, total_moves, start_depth, max_depth):
+        """
+        Choose a move from the opening book, with the endgame solver or with an
+        iterative deepening search within the deadline and node limit of the player.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            total_moves (int): The total number of moves made in the game so far.
+            start_depth (int): The depth of the first iteration.
+            max_depth (int): The depth of the last iteration, or None to deepen as long
+            as there is time.
+
+        Returns:
+            tuple: The chosen column and the deepest completed search depth.
+        """
+        if self.opening_book is not None:
+            book_entry = self.opening_book.lookup(board)
+            if book_entry is not None and board.is_valid_location(book_entry[0]):
+                return book_entry[0], 0
+
+        solution = self.solve_endgame(board, max_depth)
+        if solution is not None:
+            return solution
+
+        # Keep the results of earlier moves, but let them be replaced first
+        self.transposition_table.new_search()
+        self.clear_move_ordering()
         best_move = None
-        depth = 3  # Initial depth for iterative deepening search
+        completed_depth = 0
         time_start = time.time()
-        time_limit = 3  # seconds
+        time_limit = self.deadline - time_start
         center_columns = [3, 2, 4, 1, 5, 0, 6]
 
         # Adjust max depth based on the number of empty cells  on the board
-        max_depth = board.row_count * board.column_count - total_moves
+        depth_limit = board.row_count * board.column_count - total_moves
+        if max_depth is not None:
+            depth_limit = min(depth_limit, max_depth)
+        depth = min(start_depth, depth_limit)
         valid_moves = [
             col for col in center_columns if board.is_valid_location(col)]
 
-        beta = float("inf")
-        while time.time() - time_start < time_limit and depth <= max_depth:
-
-            best_score = alpha = float("-inf")
-            for column in valid_moves:
-                row = board.get_next_empty_row(column)
-                last_row, last_col = board.drop_chip(column, 2)
-                # If winning move is found, return it immediately
-                if board.is_winner(last_row, last_col, 2):
-                    board.board[row][column] = 0 # Undo move
-                    return column
-                score = self.minimax(
-                    board, depth-1, alpha, beta, False, total_moves+1, last_row, last_col)[1]
-                # Update alpha value as it is the best_score for the maximizing player
-                if score > best_score:
-                    best_score = score
-                    best_move = column
-
-                board.board[row][column] = 0  # Undo move
+        # Equally scored moves are told apart by how good the position looks right after
+        # them, so the choice does not depend on what earlier searches left in the table
+        first_impressions = {}
+        for column in valid_moves:
+            last_row = board.play(column, 2)
+            # If winning move is found, return it immediately
+            if board.is_winner(last_row, column, 2):
+                board.undo()
+                return column, 1
+            first_impressions[column] = board.heuristic_score
+            board.undo()
+
+        # Every other move would let the opponent win at once, so there is nothing to search
+        threats = board.winning_moves(1)
+        if threats and not threats & (threats - 1):
+            return cell_column(threats), 1
+
+        history_length = len(board.history)
+        iteration_times = [0.0, 0.0]
+        while depth <= depth_limit:
+            # Do not start an iteration that would likely not finish in time, assuming
+            # it grows as much as the previous iteration did
+            growth = iteration_times[-1] / iteration_times[-2] if iteration_times[-2] else 1
+            elapsed = time.time() - time_start
+            if elapsed >= time_limit or elapsed + iteration_times[-1] * growth > time_limit:
+                break
+            iteration_start = time.time()
+            iteration_node_start = self.searched_node_count()
+
+            try:
+                scores = self.search_root(board, valid_moves, depth, total_moves)
+            except SearchAborted:
+                # Take back the moves the abandoned iteration was searching
+                while len(board.history) > history_length:
+                    board.undo()
+                break
+            best_move = max(valid_moves, key=lambda column: (
+                scores[column], first_impressions[column], -center_columns.index(column)))
+            iteration_times.append(time.time() - iteration_start)
+            self.stats.iterations.append(
+                (depth, self.searched_node_count() - iteration_node_start, iteration_times[-1]))
+            completed_depth = depth
             depth += 1  # Increment depth for next iteration, if time allows
             valid_moves.remove(best_move)
             valid_moves.insert(0, best_move)
-        return best_move
+
+        if best_move is None:
+            # Not even the first iteration finished, so trust the first impressions
+            best_move = max(valid_moves, key=lambda column: (
+                first_impressions[column], -center_columns.index(column)))
+        return best_move, completed_depth
+
+    def solve_endgame(self, board, max_depth):
+        """
+        Solve the position exactly if it has few enough empty cells and the depth limit
+        allows searching to the end of the game. The solver counts its nodes like the
+        search does, so it stops at the deadline, the node limit and the cancel event.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            max_depth (int): The depth the search may go to, or None for no limit.
+
+        Returns:
+            tuple: The best column and the number of empty cells as the completed depth,
+            or None if the position was not solved.
+        """
+        self.last_solution = None
+        empty_cells = board.empty_cell_count()
+        if empty_cells > self.solver_threshold or (
+                max_depth is not None and max_depth < empty_cells):
+            return None
+        try:
+            best_move, score, node_count = self.solver.solve_board(board, 2)
+        except SearchAborted:
+            return None  # The search falls back to what it can do with the time left
+        self.last_solution = (score, node_count)
+        return best_move, empty_cells
+
+    def search_root(self, board, valid_moves, depth, total_moves):
+        """
+        Search the root moves of a position to a fixed depth, in this process or in the
+        worker processes of a search pool.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            valid_moves (list): The columns to search, the most promising first.
+            depth (int): The search depth of the root.
+            total_moves (int): The total number of moves made in the game so far.
+
+        Returns:
+            dict: The score of every root column.
+
+        Raises:
+            SearchAborted: If the search runs past the deadline or the node limit.
+        """
+        if self.smp_pool is not None:
+            self.smp_pool.start(
+                board, depth, total_moves, self.transposition_table.generation, self.deadline)
+        if self.search_pool is not None:
+            return self.search_pool.search(
+                board, valid_moves, depth, total_moves,
+                (self.game_count, self.transposition_table.generation), self.deadline)
+        scores = {}
+        for column in valid_moves:
+            last_row = board.play(column, 2)
+            scores[column] = self.minimax(
+                board, depth-1, float("-inf"), float("inf"), False, total_moves+1, last_row,
+                column)[1]
+            board.undo()
+        return scores
 
     def evaluate_window(self, window):
         """
@@ -76,28 +441,15 @@ class AIPlayer(Player):
             int: A numerical score indicating window desirability for the specified player.
             Positive scores favor the player, while negative scores indicate disadvantage.
         """
-        score = 0
-
-        if window.count(2) == 4:
-            score += 1000
-        if window.count(2) == 3 and window.count(0) == 1:
-            score += 100
-        if window.count(2) == 2 and window.count(0) == 2:
-            score += 10
-
-        if window.count(1) == 4:
-            score -= 1000
-        if window.count(1) == 3 and window.count(0) == 1:
-            score -= 100
-        if window.count(1) == 2 and window.count(0) == 2:
-            score -= 10
-
-        return score
+        return window_score(window.count(2), window.count(1), window.count(0))
 
     def heuristic_value(self, board):
         """
         Calculate a heuristic value to assess the desirability of the current game state.
 
+        The search reads the same value from `board.heuristic_score`, which the board
+        keeps up to date move by move. This method scans the whole board instead.
+
         Args:
             board (Board): An instance of the game board representing the current game state.
 
@@ -136,23 +488,50 @@ class AIPlayer(Player):
 
         return score
 
-    def generate_cache_key(self, board, depth, is_maximizing):
+    def early_result(self, board, depth, is_maximizing, total_moves, last_row, last_col):
         """
-        Generate a unique key for the current game state to
+        Find the result of a position that is decided without searching its moves: the
+        last move won, the board is full, the horizon is reached, the player to move
+        wins at once or the opponent has two threats that can not both be blocked.
 
         Args:
             board (Board): An instance of the game board representing the current game state.
-            depth (int): The depth of the search tree. How many moves ahead to consider.
-            is_maximizing (bool): A boolean indicating if the node is maximizing or minimizing.
+            depth (int): The remaining search depth.
+            is_maximizing (bool): True if the AI player is to move.
+            total_moves (int): The number of moves played.
+            last_row (int): The row index of the last dropped chip.
+            last_col (int): The column index of the last dropped chip.
 
         Returns:
-            tuple: A tuple containing the board state, depth, and a boolean.
+            tuple: The best move and score as minimax returns them, or None if the
+            position has to be searched, and the cells where the opponent threatens to
+            win. The threats are only found if the horizon is not reached.
         """
-        board_state = tuple(tuple(row) for row in board.board)
-        cache_key = (board_state, depth, is_maximizing)
+        if board.is_winner(last_row, last_col, 1 if is_maximizing else 2):
+            sign = -1 if is_maximizing else 1
+            return (None, sign * (WIN_SCORE + board.empty_cell_count())), 0
 
-        return cache_key
+        if total_moves == 42:
+            return (None, 0), 0
 
+        if depth == 0:
+            return (None, board.heuristic_score), 0
+
+        # Win at once if possible. Otherwise one threat of the opponent has to be
+        # blocked, and two threats can not both be blocked, so the position is lost.
+        # One ply above the horizon the wins are found among the scored children.
+        chip, sign = (2, 1) if is_maximizing else (1, -1)
+        threats = board.winning_moves(3 - chip)
+        if threats or depth > 1:
+            wins = board.winning_moves(chip)
+            if wins:
+                score = sign * (WIN_SCORE + board.empty_cell_count() - 1)
+                return (cell_column(wins), score), threats
+        if threats & (threats - 1):
+            return (None, -sign * (WIN_SCORE + board.empty_cell_count() - 2)), threats
+        return None, threats
+
+    # pylint: disable-next=too-many-statements
     def minimax(self, board, depth, alpha, beta, is_maximizing, total_moves, last_row, last_col):
         """
         Minimax algorithm with alpha-beta pruning to determine the best move for the AI player.
@@ -168,64 +547,218 @@ class AIPlayer(Player):
 
         Returns:
             int: The minimax evaluation score indicating the desirability of the current game state.
-        """
-        if is_maximizing:
-            if board.is_winner(last_row, last_col, 1):
-                return None, -3000
-        else:
-            if board.is_winner(last_row, last_col, 2):
-                return None, 3000
-
-        if total_moves == 42:
-            return None, 0
-
-        if depth == 0:
-            return None, self.heuristic_value(board)
 
+        Raises:
+            SearchAborted: If the search runs past the deadline or the node limit.
+        """
+        self.count_node()
+        stats = self.stats
+        early_result, threats = self.early_result(
+            board, depth, is_maximizing, total_moves, last_row, last_col)
+        if early_result is not None:
+            stats.leaves += 1
+            return early_result
+
+        chip = 2 if is_maximizing else 1
+        alpha_original, beta_original = alpha, beta
+        cache_key = board.zobrist_hash ^ MAXIMIZING_KEY if is_maximizing else board.zobrist_hash
+        best_cached_move = None
+        entry = self.transposition_table.probe(cache_key)
+        stats.table_probes += 1
+        if entry is not None:
+            stats.table_hits += 1
+            cached_value, cached_depth, flag, best_cached_move = entry
+            if cached_depth >= depth:
+                if flag == EXACT:
+                    return best_cached_move, cached_value
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, cached_value)
+                else:
+                    beta = min(beta, cached_value)
+                if alpha >= beta:
+                    return best_cached_move, cached_value
 
-        cache_key = self.generate_cache_key(board, depth, is_maximizing)
-        center_columns = [3, 2, 4, 1, 5, 0, 6]
-        valid_moves = [
-            column for column in center_columns if board.is_valid_location(column)]
+        if threats:
+            valid_moves = [cell_column(threats)]
+        elif depth == 1:
+            valid_moves = self.order_moves(board, best_cached_move)
+        else:
+            valid_moves = self.order_moves(board, best_cached_move, chip, total_moves)
 
-        best_cached_move = self.cache.get(cache_key, None)
-        if best_cached_move is not None:
-            valid_moves.remove(best_cached_move)
-            valid_moves.insert(0, best_cached_move)
+        if depth == 1:
+            best_move, value = self.evaluate_leaves(board, valid_moves, is_maximizing, total_moves)
+            self.store_result(cache_key, value, depth, alpha_original, beta_original, best_move)
+            return best_move, value
 
         if is_maximizing:
             best_move = None
             value = float("-inf")
             for column in valid_moves:
-                row = board.get_next_empty_row(column)
-                board_copy = board.copy()
-                last_row, last_col = board_copy.drop_chip(column, 2)
+                last_row = board.play(column, 2)
                 new_value = self.minimax(
-                    board_copy, depth-1, alpha, beta, False, total_moves+1, last_row, last_col)[1]
-                board_copy.board[row][column] = 0  # Undo move
+                    board, depth-1, alpha, beta, False, total_moves+1, last_row, column)[1]
+                board.undo()
                 if float(new_value) > value:
                     value = new_value
                     best_move = column
                 alpha = max(alpha, value)
                 if alpha >= beta:
+                    stats.cutoffs += 1
+                    stats.first_move_cutoffs += column == valid_moves[0]
+                    self.record_cutoff(chip, column, last_row, depth, total_moves)
                     break
-            self.cache[cache_key] = best_move
+            self.store_result(cache_key, value, depth, alpha_original, beta_original, best_move)
             return best_move, value
         best_move = None
         value = float("inf")
         for column in valid_moves:
-            row = board.get_next_empty_row(column)
-            board_copy = board.copy()
-            last_row, last_col = board_copy.drop_chip(column, 1)
-            total_moves += 1
+            last_row = board.play(column, 1)
             new_value = self.minimax(
-                board_copy, depth-1, alpha, beta, True, total_moves+1, last_row, last_col)[1]
-            board_copy.board[row][column] = 0  # Undo move
+                board, depth-1, alpha, beta, True, total_moves+1, last_row, column)[1]
+            board.undo()
             if float(new_value) < value:
                 value = new_value
                 best_move = column
             beta = min(beta, value)
             if alpha >= beta:
+                stats.cutoffs += 1
+                stats.first_move_cutoffs += column == valid_moves[0]
+                self.record_cutoff(chip, column, last_row, depth, total_moves)
                 break
-        self.cache[cache_key] = best_move
+        self.store_result(cache_key, value, depth, alpha_original, beta_original, best_move)
+        return best_move, value
+
+    def count_node(self):
+        """
+        Count a searched node, check the node limit, and check the deadline and the
+        cancel event every DEADLINE_CHECK_INTERVAL nodes.
+
+        Raises:
+            SearchAborted: If the search runs past the deadline or the node limit, or
+            it is cancelled.
+        """
+        if self.node_count >= self.node_limit:
+            raise SearchAborted("The search ran out of its node budget")
+        self.node_count += 1
+        if self.node_count % DEADLINE_CHECK_INTERVAL == 0:
+            if time.time() > self.deadline:
+                raise SearchAborted("The search ran past its deadline")
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise SearchAborted("The search was cancelled")
+
+    def order_moves(self, board, best_cached_move, chip=None, total_moves=None):
+        """
+        Order the valid moves of a node, the best move stored in the transposition table
+        first and the rest from the center outwards.
+
+        With the chip to move, the killer moves of the ply come right after the stored
+        move, and the other moves are sorted by their history scores, equal scores
+        from the center outwards.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            best_cached_move (int): The best move stored for the node, or None.
+            chip (int, optional): The chip to move, to order by the killer moves and the
+            history scores. Defaults to None.
+            total_moves (int, optional): The total number of moves made, which picks the
+            killer moves of the ply. Defaults to None.
+
+        Returns:
+            list: The valid columns in the order to search them.
+        """
+        center_columns = [3, 2, 4, 1, 5, 0, 6]
+        valid_moves = [
+            column for column in center_columns if board.is_valid_location(column)]
+        if chip is not None:
+            history = self.history[chip]
+            heights = board.heights
+            top_row = board.row_count - 1
+            valid_moves.sort(
+                key=lambda column: history[column][top_row - heights[column]], reverse=True)
+            for killer in reversed(self.killer_moves[total_moves]):
+                if killer in valid_moves:
+                    valid_moves.remove(killer)
+                    valid_moves.insert(0, killer)
+        if best_cached_move is not None:
+            valid_moves.remove(best_cached_move)
+            valid_moves.insert(0, best_cached_move)
+        return valid_moves
+
+    def record_cutoff(self, chip, column, row, depth, total_moves):
+        """
+        Remember a move that caused a beta cutoff, as a killer move of its ply and in
+        the history scores, so that it is searched early in similar positions.
+
+        Args:
+            chip (int): The chip of the player who made the move.
+            column (int): The column of the move.
+            row (int): The row the chip landed in.
+            depth (int): The depth of the node the cutoff happened in. Deeper cutoffs
+            save more work, so they weigh more.
+            total_moves (int): The total number of moves made before the move.
+        """
+        self.history[chip][column][row] += depth * depth
+        killers = self.killer_moves[total_moves]
+        if killers[0] != column:
+            killers[1] = killers[0]
+            killers[0] = column
+
+    def clear_move_ordering(self):
+        """
+        Forget the killer moves and history scores. They are kept across the iterations
+        of a search and cleared when the search of a new move starts.
+        """
+        self.killer_moves = [[None, None] for _ in range(ROW_COUNT * COLUMN_COUNT + 1)]
+        self.history = {
+            chip: [[0] * ROW_COUNT for _ in range(COLUMN_COUNT)] for chip in (1, 2)
+        }
+
+    def evaluate_leaves(self, board, valid_moves, is_maximizing, total_moves):
+        """
+        Evaluate all children of a node one move above the search horizon together.
+        The children are scored by the board from its window counts without playing the
+        moves, which saves a minimax call for every leaf.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            valid_moves (list): The columns to evaluate, in the order to prefer them.
+            is_maximizing (bool): A boolean indicating if the node is maximizing or minimizing.
+            total_moves (int): The total number of moves made in the game so far.
+
+        Returns:
+            tuple: The best column and its evaluation score.
+        """
+        self.stats.leaves += len(valid_moves)
+        chip, sign = (2, 1) if is_maximizing else (1, -1)
+        win_value = sign * (WIN_SCORE + board.empty_cell_count() - 1)
+        best_move = None
+        value = -sign * float("inf")
+        for column, (wins, score) in zip(valid_moves, board.score_moves(valid_moves, chip)):
+            if wins:
+                return column, win_value
+            new_value = 0 if total_moves + 1 == 42 else score
+            if sign * new_value > sign * value:
+                value = new_value
+                best_move = column
         return best_move, value
+
+    def store_result(self, cache_key, value, depth, alpha, beta, best_move):
+        """
+        Store a minimax result in the transposition table with its bound type.
+
+        Args:
+            cache_key (int): The Zobrist hash of the position and the side to move.
+            value (int): The minimax evaluation score of the position.
+            depth (int): The depth the position was searched to.
+            alpha (float): The alpha value the position was searched with.
+            beta (float): The beta value the position was searched with.
+            best_move (int): The best column found for the position.
+        """
+        if value <= alpha:
+            flag = UPPER_BOUND
+        elif value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.stats.table_stores += 1
+        self.transposition_table.store(cache_key, value, depth, flag, best_move)
@@ -0,0 +1,172 @@
+"""
+Connect Four Background AI Module
+"""
+
+import multiprocessing
+from .ai_player import AIPlayer
+from .board import Board
+from .search_limits import SharedCancelEvent
+
+
+def _serve(connection, cancelled_id, args, kwargs):
+    """
+    Answer search requests with an AI player until told to stop.
+
+    Args:
+        connection (Connection): The end of the pipe to the game process.
+        cancelled_id (multiprocessing.Value): The id of the last request cancelled by
+        the game process. Requests up to it are skipped, or stopped if they are running.
+        args (tuple): The positional arguments of the AI player.
+        kwargs (dict): The keyword arguments of the AI player.
+    """
+    player = AIPlayer(*args, **kwargs)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        if message[0] == "new_game":
+            player.new_game()
+            continue
+        kind, request_id, cells, total_moves, limits = message
+        player.cancel_event = SharedCancelEvent(cancelled_id, request_id)
+        if player.cancel_event.is_set():
+            continue  # Cancelled before the worker got to it
+        board = Board()
+        board.cells[:] = cells
+        board.sync_bitboards()
+        if kind == "search":
+            connection.send((request_id, player.get_best_move(board, total_moves, **limits)))
+        elif kind == "ponder":
+            player.ponder(board, total_moves, **limits)
+    player.close()
+
+
+class AIWorker:  # pylint: disable=too-many-instance-attributes
+    """
+    Represents an AI player searching in a background process, so that the game window
+    keeps drawing and handling events while the AI thinks.
+
+    The worker process keeps one AI player, and its transposition table, for as long as
+    the worker runs. Searches are started with `start_search`, polled with `poll` and
+    their results taken with `take_move`. Every request sent to the worker has an id,
+    and cancelling stops all requests sent so far, including those the worker has not
+    read yet. A cancelled search stops within a few thousand nodes and its result is
+    thrown away. While the opponent is thinking, the worker can `ponder` the answers to
+    the opponent's possible moves.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Start the worker process.
+
+        Args:
+            args: The positional arguments of the AI player, such as its id.
+            kwargs: The keyword arguments of the AI player.
+        """
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.cancelled_id = multiprocessing.Value("q", 0, lock=False)
+        self.process = multiprocessing.Process(
+            target=_serve, args=(worker_connection, self.cancelled_id, args, kwargs),
+            daemon=True)
+        self.process.start()
+        worker_connection.close()
+        self.request_id = 0  # Id of the last search or ponder request sent
+        self.search_id = 0  # Request id of the latest search
+        self.searching = False
+        self.pondering = False
+        self.ready = False  # Whether move holds the result of the latest search
+        self.move = None
+
+    def start_search(self, board, total_moves, **limits):
+        """
+        Start searching the best move of a position. The position is copied, so the
+        board can be changed and drawn while the search runs.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            total_moves (int): The total number of moves made in the game so far.
+            limits: Keyword arguments passed on to `AIPlayer.get_best_move`, such as
+            time_limit.
+        """
+        self.cancel()
+        self.request_id += 1
+        self.search_id = self.request_id
+        self.searching = True
+        self.ready = False
+        self.move = None
+        self.connection.send(
+            ("search", self.search_id, board.cells.copy(), total_moves, limits))
+
+    def ponder(self, board, total_moves, **limits):
+        """
+        Start searching the answers to the opponent's possible moves in the background.
+        Pondering goes on until it has answered every move or a search is started, and
+        the search returns the pondered answer at once if there is one.
+
+        Args:
+            board (Board): An instance of the game board with the opponent to move.
+            total_moves (int): The total number of moves made in the game so far.
+            limits: Keyword arguments passed on to `AIPlayer.get_best_move`, such as
+            time_limit.
+        """
+        self.cancel()
+        self.request_id += 1
+        self.pondering = True
+        self.connection.send(
+            ("ponder", self.request_id, board.cells.copy(), total_moves, limits))
+
+    def poll(self, timeout=0):
+        """
+        Check whether the search has finished. Results of cancelled searches are
+        skipped.
+
+        Args:
+            timeout (float, optional): The time in seconds to wait for the result.
+            Defaults to 0, which does not wait.
+
+        Returns:
+            bool: True if the result of the search is ready to be taken, False otherwise.
+        """
+        while self.searching and self.connection.poll(timeout):
+            search_id, move = self.connection.recv()
+            if search_id == self.search_id:
+                self.searching = False
+                self.ready = True
+                self.move = move
+        return self.ready
+
+    def take_move(self):
+        """
+        Take the result of the finished search.
+
+        Returns:
+            int: The best column found by the search, or None if there was no move.
+        """
+        self.ready = False
+        return self.move
+
+    def cancel(self):
+        """
+        Cancel the search or pondering in progress, and any request the worker has not
+        read yet. Answers pondered so far are kept for the next search.
+        """
+        self.cancelled_id.value = self.request_id
+        self.searching = False  # Any result still on its way is now out of date
+        self.pondering = False
+        self.ready = False
+
+    def new_game(self):
+        """
+        Cancel the search in progress and prepare the AI player for a new game.
+        """
+        self.cancel()
+        self.connection.send(("new_game",))
+
+    def close(self):
+        """
+        Cancel the search in progress and stop the worker process.
+        """
+        self.cancel()
+        self.connection.send(None)
+        self.process.join()
+        self.connection.close()
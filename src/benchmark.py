@@ -0,0 +1,271 @@
+"""
+Connect Four Engine Benchmark
+
+Measures the speed of the engine on a fixed corpus of positions: the nodes per second
+of `AIPlayer.minimax`, the time `AIPlayer.get_best_move` takes to complete each depth,
+the calls per second of the heuristic evaluations and `Board.is_winner`, and the peak
+memory of a search. The results are written as JSON, and can be compared against a
+stored baseline to find regressions.
+
+The endgame solver is turned off, so near-endgame positions time the search as well.
+The nodes per second of minimax are always measured in a single process, so
+--processes and --threads only change the get_best_move timings.
+
+Usage:
+    python -m src.benchmark --output benchmark.json
+    python -m src.benchmark --compare benchmark.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from .board import Board
+from .ai_player import AIPlayer
+from . import evaluation
+
+# Positions with the AI (player 2) to move, as the columns played with player 1 starting
+CORPUS = {
+    "opening_center": ("opening", [3]),
+    "opening_three": ("opening", [3, 3, 2]),
+    "middlegame_13": ("middlegame", [3, 1, 0, 0, 3, 3, 4, 0, 2, 5, 2, 4, 3]),
+    "middlegame_19": ("middlegame",
+                      [4, 2, 0, 1, 2, 4, 6, 3, 1, 4, 5, 3, 3, 4, 0, 1, 4, 1, 6]),
+    "endgame_27": ("near-endgame",
+                   [2, 1, 2, 2, 0, 0, 3, 6, 2, 3, 1, 1, 6, 2, 0, 0, 3, 4, 2, 6, 5, 4, 4,
+                    3, 0, 3, 1]),
+    "endgame_29": ("near-endgame",
+                   [3, 4, 0, 4, 5, 3, 0, 1, 1, 1, 0, 6, 2, 3, 4, 6, 5, 0, 6, 3, 3, 3, 6,
+                    6, 2, 0, 1, 4, 4]),
+    "tactical_win": ("tactical", [0, 3, 1, 3, 6, 3, 5]),
+    "tactical_stacked": ("tactical", [3, 4, 3, 4, 2, 3, 2]),
+}
+
+# Metrics where a higher value is better, the others are better lower
+HIGHER_IS_BETTER = (
+    "minimax_nodes_per_sec", "heuristic_calls_per_sec", "vectorized_calls_per_sec",
+    "is_winner_calls_per_sec")
+LOWER_IS_BETTER = ("get_best_move_seconds", "peak_memory_bytes")
+
+
+def load_position(moves):
+    """
+    Play the moves of a corpus position on an empty board.
+
+    Args:
+        moves (list): The columns played, with player 1 starting.
+
+    Returns:
+        tuple: The board, the row of the last move and the column of the last move.
+    """
+    board = Board()
+    last_row = last_col = None
+    for ply, column in enumerate(moves):
+        last_row, last_col = board.play(column, 1 + ply % 2), column
+    return board, last_row, last_col
+
+
+def calls_per_second(function, calls):
+    """
+    Measure how many times per second a function can be called.
+
+    Args:
+        function (callable): The function to call without arguments.
+        calls (int): The number of calls to time.
+
+    Returns:
+        float: The number of calls per second.
+    """
+    time_start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return calls / max(time.perf_counter() - time_start, 1e-9)
+
+
+def benchmark_position(moves, depth, calls, player_options):
+    """
+    Benchmark the engine on one position.
+
+    Args:
+        moves (list): The columns played to reach the position.
+        depth (int): The search depth of minimax and get_best_move.
+        calls (int): The number of calls to time for the evaluations and is_winner.
+        player_options (dict): Keyword arguments of the AI players searching with
+        get_best_move, such as processes.
+
+    Returns:
+        dict: The measured metrics of the position.
+    """
+    board, last_row, last_col = load_position(moves)
+    total_moves = len(moves)
+    player_options = {**player_options, "solver_threshold": 0}
+    result = {}
+
+    # Minimax searches in this process, whatever the options of the other players
+    player = AIPlayer(2, solver_threshold=0)
+    time_start = time.perf_counter()
+    player.minimax(board, depth, float("-inf"), float("inf"), True, total_moves,
+                   last_row, last_col)
+    elapsed = time.perf_counter() - time_start
+    result["minimax_nodes"] = player.node_count
+    result["minimax_nodes_per_sec"] = player.node_count / max(elapsed, 1e-9)
+
+    time_to_depth = {}
+    for search_depth in range(1, depth + 1):
+        player = AIPlayer(2, **player_options)
+        try:
+            player.get_best_move(board, total_moves, start_depth=1, max_depth=search_depth)
+        finally:
+            player.close()
+        time_to_depth[str(search_depth)] = player.last_result.elapsed
+    result["time_to_depth"] = time_to_depth
+    result["get_best_move_seconds"] = time_to_depth[str(depth)]
+    result["get_best_move_nodes"] = player.last_result.nodes
+
+    player = AIPlayer(2)
+    result["heuristic_calls_per_sec"] = calls_per_second(
+        lambda: player.heuristic_value(board), calls)
+    result["vectorized_calls_per_sec"] = calls_per_second(
+        lambda: evaluation.heuristic_value(board), calls)
+    chip = 1 + (total_moves - 1) % 2
+    result["is_winner_calls_per_sec"] = calls_per_second(
+        lambda: board.is_winner(last_row, last_col, chip), calls)
+
+    # Traced separately, since tracing the allocations slows the search down
+    player = AIPlayer(2, solver_threshold=0)
+    tracemalloc.start()
+    try:
+        player.get_best_move(board, total_moves, start_depth=1, max_depth=depth)
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def best_of(runs):
+    """
+    Combine repeated measurements of a position into the best value of every metric,
+    which is the least disturbed by other work on the machine.
+
+    Args:
+        runs (list): The metrics of every run, as returned by `benchmark_position`.
+
+    Returns:
+        dict: The best value of every metric.
+    """
+    best = dict(runs[0])
+    for run in runs[1:]:
+        for metric in HIGHER_IS_BETTER:
+            best[metric] = max(best[metric], run[metric])
+        for metric in LOWER_IS_BETTER:
+            best[metric] = min(best[metric], run[metric])
+        best["time_to_depth"] = {
+            depth: min(seconds, run["time_to_depth"][depth])
+            for depth, seconds in best["time_to_depth"].items()
+        }
+    return best
+
+
+def run_benchmark(names, depth, calls, player_options, repeat=1):
+    """
+    Benchmark the engine on corpus positions.
+
+    Args:
+        names (list): The names of the corpus positions.
+        depth (int): The search depth of minimax and get_best_move.
+        calls (int): The number of calls to time for the evaluations and is_winner.
+        player_options (dict): Keyword arguments of the AI players, such as processes.
+        repeat (int, optional): The number of runs per position, of which the best
+        values are kept. Defaults to 1.
+
+    Returns:
+        dict: The settings of the run and the metrics of every position by name.
+    """
+    positions = {}
+    for name in names:
+        category, moves = CORPUS[name]
+        runs = [benchmark_position(moves, depth, calls, player_options)
+                for _ in range(repeat)]
+        positions[name] = {"category": category, **best_of(runs)}
+        print(f"{name}: {positions[name]['minimax_nodes_per_sec']:.0f} nodes/s", flush=True)
+    return {"depth": depth, "player_options": player_options, "positions": positions}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare benchmark results against a baseline.
+
+    Args:
+        results (dict): The results of the current run.
+        baseline (dict): The results of the baseline run.
+        tolerance (float): The relative change allowed before a metric is flagged.
+
+    Returns:
+        list: Descriptions of the metrics that got worse by more than the tolerance.
+    """
+    regressions = []
+    for name, metrics in results["positions"].items():
+        old_metrics = baseline["positions"].get(name)
+        if old_metrics is None:
+            continue
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            old, new = old_metrics.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = new / old - 1
+            worse = change < -tolerance if metric in HIGHER_IS_BETTER else change > tolerance
+            if worse:
+                regressions.append(f"{name} {metric}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+    return regressions
+
+
+def main(argv=None):
+    """
+    Run the benchmark from the command line.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: 1 if a regression against the baseline was found, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Connect Four engine.")
+    parser.add_argument("--depth", type=int, default=8, help="search depth per position")
+    parser.add_argument("--calls", type=int, default=2000,
+                        help="number of timed calls of the evaluations and is_winner")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of runs per position, of which the best is kept")
+    parser.add_argument("--positions", nargs="+", choices=sorted(CORPUS),
+                        default=list(CORPUS), help="corpus positions to benchmark")
+    parser.add_argument("--processes", type=int,
+                        help="search the root moves of get_best_move in this many "
+                             "worker processes")
+    parser.add_argument("--threads", type=int,
+                        help="search get_best_move with this many lazy SMP processes")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", help="JSON file of baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="relative change allowed before a regression is flagged")
+    args = parser.parse_args(argv)
+
+    player_options = {option: getattr(args, option) for option in ("processes", "threads")
+                      if getattr(args, option)}
+    results = run_benchmark(args.positions, args.depth, args.calls, player_options,
+                            args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
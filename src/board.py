@@ -2,21 +2,279 @@
 Connect Four Board Module
 """
 
+import random
 import numpy as np
 
+ROW_COUNT = 6
+COLUMN_COUNT = 7
+# Every column takes ROW_COUNT bits plus one empty sentinel bit on top, which keeps
+# the shifted masks of neighbouring columns from bleeding into each other.
+COLUMN_HEIGHT = ROW_COUNT + 1
+# Shift distances of the four line directions: vertical, horizontal and both diagonals.
+DIRECTION_SHIFTS = (1, COLUMN_HEIGHT, COLUMN_HEIGHT - 1, COLUMN_HEIGHT + 1)
+# The bottom cell of every column
+BOTTOM_MASK = sum(1 << (column * COLUMN_HEIGHT) for column in range(COLUMN_COUNT))
+# Every cell of the board, without the sentinel bits
+BOARD_MASK = BOTTOM_MASK * ((1 << ROW_COUNT) - 1)
 
-class Board:
+
+def _zobrist_keys(seed):
+    """
+    Generate a random 64-bit Zobrist key for every bit position of the bitboards.
+
+    Args:
+        seed (int): The seed of the generator, so that the keys are the same in every run.
+
+    Returns:
+        list: The keys indexed by the bit position of a cell.
+    """
+    generator = random.Random(seed)
+    return [generator.getrandbits(64) for _ in range(COLUMN_COUNT * COLUMN_HEIGHT)]
+
+
+# Zobrist keys per chip. Chips other than 1 and 2 use the keys stored under 0
+ZOBRIST_KEYS = {0: _zobrist_keys(0), 1: _zobrist_keys(1), 2: _zobrist_keys(2)}
+
+
+def cell_index(row, column):
+    """
+    Get the bitboard bit position of a board cell.
+
+    Args:
+        row (int): The row index of the cell, 0 being the top row.
+        column (int): The column index of the cell.
+
+    Returns:
+        int: The bit position of the cell.
+    """
+    return column * COLUMN_HEIGHT + ROW_COUNT - 1 - row
+
+
+def cell_bit(row, column):
+    """
+    Get the bitboard bit of a board cell.
+
+    Args:
+        row (int): The row index of the cell, 0 being the top row.
+        column (int): The column index of the cell.
+
+    Returns:
+        int: An integer with only the bit of the given cell set.
+    """
+    return 1 << cell_index(row, column)
+
+
+def winning_cells(mask, occupied):
+    """
+    Find the empty cells that would complete four in a row for a player.
+
+    Args:
+        mask (int): The bitboard of the player.
+        occupied (int): The bitboard of all chips on the board.
+
+    Returns:
+        int: A bitboard of the empty cells, playable or not, that win for the player.
+    """
+    # Vertical lines can only be completed from above
+    cells = (mask << 1) & (mask << 2) & (mask << 3)
+    for shift in DIRECTION_SHIFTS[1:]:
+        pairs = (mask << shift) & (mask << 2 * shift)
+        cells |= pairs & (mask << 3 * shift)
+        cells |= pairs & (mask >> shift)
+        pairs = (mask >> shift) & (mask >> 2 * shift)
+        cells |= pairs & (mask << shift)
+        cells |= pairs & (mask >> 3 * shift)
+    return cells & (BOARD_MASK ^ occupied)
+
+
+def playable_cells(occupied):
+    """
+    Find the cells where the next chip of each column would land.
+
+    Args:
+        occupied (int): The bitboard of all chips on the board.
+
+    Returns:
+        int: A bitboard with the next free cell of every column that has room.
+    """
+    return (occupied + BOTTOM_MASK) & BOARD_MASK
+
+
+def cell_column(cells):
+    """
+    Get the column of the first cell of a bitboard.
+
+    Args:
+        cells (int): A bitboard with at least one cell set.
+
+    Returns:
+        int: The column of the cell with the lowest bit position.
+    """
+    return ((cells & -cells).bit_length() - 1) // COLUMN_HEIGHT
+
+
+def mirror_key(key):
+    """
+    Mirror a position key from `Board.position_key` left to right.
+
+    Args:
+        key (int): The key of a position.
+
+    Returns:
+        int: The key of the mirrored position.
+    """
+    column_mask = (1 << COLUMN_HEIGHT) - 1
+    mirrored = 0
+    for column in range(COLUMN_COUNT):
+        column_bits = (key >> (column * COLUMN_HEIGHT)) & column_mask
+        mirrored |= column_bits << ((COLUMN_COUNT - 1 - column) * COLUMN_HEIGHT)
+    return mirrored
+
+
+def _windows():
+    """
+    Generate every window of four cells in a row on the board.
+
+    Returns:
+        list: The windows as lists of (row, column) cells, horizontal windows first,
+        then vertical, positive slope and negative slope windows.
+    """
+    windows = []
+    for row in range(ROW_COUNT):
+        for column in range(COLUMN_COUNT - 3):
+            windows.append([(row, column + i) for i in range(4)])
+    for column in range(COLUMN_COUNT):
+        for row in range(ROW_COUNT - 3):
+            windows.append([(row + i, column) for i in range(4)])
+    for row in range(ROW_COUNT - 3):
+        for column in range(COLUMN_COUNT - 3):
+            windows.append([(row + i, column + i) for i in range(4)])
+    for row in range(ROW_COUNT - 3):
+        for column in range(COLUMN_COUNT - 3):
+            windows.append([(row + 3 - i, column + i) for i in range(4)])
+    return windows
+
+
+WINDOWS = _windows()
+# Indices of the windows that go through each cell, indexed by bit position
+CELL_WINDOWS = [[] for _ in range(COLUMN_COUNT * COLUMN_HEIGHT)]
+for _window_index, _window in enumerate(WINDOWS):
+    for _row, _column in _window:
+        CELL_WINDOWS[cell_index(_row, _column)].append(_window_index)
+
+
+def window_score(ai_chips, opponent_chips, empty_cells):
+    """
+    Score a window of four cells from the point of view of the AI player (chip 2).
+
+    Args:
+        ai_chips (int): The number of AI chips in the window.
+        opponent_chips (int): The number of opponent chips (chip 1) in the window.
+        empty_cells (int): The number of empty cells in the window.
+
+    Returns:
+        int: A numerical score indicating window desirability for the AI player.
+    """
+    score = 0
+
+    if ai_chips == 4:
+        score += 1000
+    if ai_chips == 3 and empty_cells == 1:
+        score += 100
+    if ai_chips == 2 and empty_cells == 2:
+        score += 10
+
+    if opponent_chips == 4:
+        score -= 1000
+    if opponent_chips == 3 and empty_cells == 1:
+        score -= 100
+    if opponent_chips == 2 and empty_cells == 2:
+        score -= 10
+
+    return score
+
+
+# The contents of a window are encoded as ai_chips * 25 + opponent_chips * 5 + other_chips,
+# so dropping a chip into a window adds the step of that chip to the window's code.
+CHIP_STEPS = {2: 25, 1: 5}
+OTHER_CHIP_STEP = 1
+WINDOW_SCORES = [0] * 150
+for _code in range(125):
+    _ai_chips, _opponent_chips, _other_chips = _code // 25, _code // 5 % 5, _code % 5
+    if _ai_chips + _opponent_chips + _other_chips <= 4:
+        WINDOW_SCORES[_code] = window_score(
+            _ai_chips, _opponent_chips, 4 - _ai_chips - _opponent_chips - _other_chips)
+# Change of the window score when a chip with the given step is added to a window
+SCORE_DELTAS = {
+    step: [WINDOW_SCORES[code + step] - WINDOW_SCORES[code] for code in range(125)]
+    for step in (25, 5, 1)}
+
+
+def has_four(mask):
+    """
+    Check if a bitboard contains four bits in a row in any direction.
+
+    Args:
+        mask (int): The bitboard of a single player.
+
+    Returns:
+        bool: True if the bitboard contains four in a row, False otherwise.
+    """
+    for shift in DIRECTION_SHIFTS:
+        pairs = mask & (mask >> shift)
+        if pairs & (pairs >> 2 * shift):
+            return True
+    return False
+
+
+class BoardArray(np.ndarray):
+    """
+    NumPy view of a board that marks the board stale when its cells are written
+    directly, so the bitboards can be rebuilt before they are used next.
+    """
+
+    def __array_finalize__(self, obj):
+        # pylint: disable=attribute-defined-outside-init
+        # Only views share the cells of the board; copies and results of operations do not
+        owner = getattr(obj, "owner", None)
+        self.owner = owner if owner is not None and np.may_share_memory(self, obj) else None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        owner = getattr(self, "owner", None)
+        if owner is not None:
+            owner.stale = True
+
+
+class Board:  # pylint: disable=too-many-instance-attributes
     """
     Represents a Connect Four board.
+
+    The game state is stored as bitboards: one integer per player and one integer for
+    all occupied cells, together with the height of each column and an incrementally
+    updated Zobrist hash of the position. The board also keeps the contents of every
+    window of four cells and the heuristic score they add up to, updating only the
+    windows through the changed cell on each move. The NumPy array in
+    `board` is kept in sync with the bitboards for drawing and inspection, and cells
+    written into it directly are picked up by the next board operation.
     """
 
     def __init__(self):
         """
         Initialize a Connect Four board.
         """
-        self.row_count = 6
-        self.column_count = 7
+        self.row_count = ROW_COUNT
+        self.column_count = COLUMN_COUNT
         self.board = self.generate_board()
+        self.cells = self.board.view(np.ndarray)  # Plain view for writes that keep sync
+        self.bitboards = {1: 0, 2: 0}
+        self.occupied = 0
+        self.heights = [0] * COLUMN_COUNT
+        self.zobrist_hash = 0
+        self.history = []  # Columns of the chips played, for undoing them
+        self.window_codes = [0] * len(WINDOWS)
+        self.heuristic_score = 0
+        self.stale = False
 
     def generate_board(self):
         """
@@ -25,7 +283,8 @@ class Board:
         Returns:
             array: A 2D array representing the Connect Four board.
         """
-        board = np.zeros((self.row_count, self.column_count), dtype=int)
+        board = np.zeros((self.row_count, self.column_count), dtype=int).view(BoardArray)
+        board.owner = self
         return board
 
     def copy(self):
@@ -36,9 +295,51 @@ class Board:
             Board: A copy of the current board.
         """
         board_copy = Board()
-        board_copy.board = self.board.copy()
+        board_copy.cells[:] = self.cells
+        board_copy.stale = self.stale
+        board_copy.bitboards = dict(self.bitboards)
+        board_copy.occupied = self.occupied
+        board_copy.heights = list(self.heights)
+        board_copy.zobrist_hash = self.zobrist_hash
+        board_copy.history = list(self.history)
+        board_copy.window_codes = list(self.window_codes)
+        board_copy.heuristic_score = self.heuristic_score
         return board_copy
 
+    def sync_bitboards(self):
+        """
+        Rebuild the bitboards and column heights from the NumPy array.
+
+        Called automatically by the board operations after the `board` array has
+        been edited directly instead of through `drop_chip`. A column's height is the
+        number of chips stacked from its bottom without a gap. The move history is
+        cleared, as moves made before the edit can no longer be undone reliably.
+        """
+        self.bitboards = {1: 0, 2: 0}
+        self.occupied = 0
+        self.zobrist_hash = 0
+        for column in range(self.column_count):
+            height = None
+            for row in range(self.row_count - 1, -1, -1):
+                chip = int(self.cells[row][column])
+                if chip == 0:
+                    if height is None:
+                        height = self.row_count - 1 - row
+                    continue
+                index = cell_index(row, column)
+                self.occupied |= 1 << index
+                if chip in self.bitboards:
+                    self.bitboards[chip] |= 1 << index
+                self.zobrist_hash ^= ZOBRIST_KEYS.get(chip, ZOBRIST_KEYS[0])[index]
+            self.heights[column] = self.row_count if height is None else height
+        self.history = []
+        self.window_codes = [
+            sum(CHIP_STEPS.get(chip, OTHER_CHIP_STEP)
+                for chip in (self.cells.item(row, column) for row, column in window) if chip)
+            for window in WINDOWS]
+        self.heuristic_score = sum(WINDOW_SCORES[code] for code in self.window_codes)
+        self.stale = False
+
     def drop_chip(self, column, chip):
         """
         Drop a chip into the specified column of the board.
@@ -51,12 +352,109 @@ class Board:
             tuple: A tuple representing the location of the dropped chip (row, column).
             Otherwise, None.
         """
-        row = self.get_next_empty_row(column)
-        if row is not None:  # Check if a valid row was found
-            self.board[row][column] = chip
-            return (row, column)
+        if self.stale:
+            self.sync_bitboards()
+        if self.heights[column] == self.row_count:
+            return None
+
+        return (self.play(column, chip), column)
 
-        return None
+    def play(self, column, chip):
+        """
+        Play a chip into a column that has room for it and record the move for undo.
+
+        Args:
+            column (int): The column where the chip will be placed.
+            chip (int): The player's chip (1 for red, 2 for yellow)
+
+        Returns:
+            int: The row index of the played chip.
+        """
+        if self.stale:
+            self.sync_bitboards()
+        height = self.heights[column]
+        row = self.row_count - 1 - height
+        index = column * COLUMN_HEIGHT + height
+        bit = 1 << index
+        self.occupied |= bit
+        if chip in self.bitboards:
+            self.bitboards[chip] |= bit
+        self.zobrist_hash ^= ZOBRIST_KEYS.get(chip, ZOBRIST_KEYS[0])[index]
+        step = CHIP_STEPS.get(chip, OTHER_CHIP_STEP)
+        deltas = SCORE_DELTAS[step]
+        codes = self.window_codes
+        score = self.heuristic_score
+        for window in CELL_WINDOWS[index]:
+            code = codes[window]
+            score += deltas[code]
+            codes[window] = code + step
+        self.heuristic_score = score
+        self.heights[column] = height + 1
+        self.history.append(column)
+        self.cells[row, column] = chip
+        return row
+
+    def undo(self):
+        """
+        Take back the latest move played on the board.
+
+        Returns:
+            tuple: A tuple representing the location of the removed chip (row, column).
+            Otherwise, None if there is no move to take back.
+        """
+        if self.stale:
+            self.sync_bitboards()
+        if not self.history:
+            return None
+
+        column = self.history.pop()
+        height = self.heights[column] - 1
+        row = self.row_count - 1 - height
+        index = column * COLUMN_HEIGHT + height
+        bit = 1 << index
+        chip = self.cells.item(row, column)
+        self.occupied ^= bit
+        if chip in self.bitboards:
+            self.bitboards[chip] ^= bit
+        self.zobrist_hash ^= ZOBRIST_KEYS.get(chip, ZOBRIST_KEYS[0])[index]
+        step = CHIP_STEPS.get(chip, OTHER_CHIP_STEP)
+        deltas = SCORE_DELTAS[step]
+        codes = self.window_codes
+        score = self.heuristic_score
+        for window in CELL_WINDOWS[index]:
+            code = codes[window] - step
+            score -= deltas[code]
+            codes[window] = code
+        self.heuristic_score = score
+        self.heights[column] = height
+        self.cells[row, column] = 0
+        return (row, column)
+
+    def score_moves(self, columns, chip):
+        """
+        Score the positions after each of the given moves at once, without playing them.
+
+        Args:
+            columns (list): The columns to score, each with room for a chip.
+            chip (int): The player's chip (1 for red, 2 for yellow)
+
+        Returns:
+            list: A tuple (wins, heuristic_score) for each column, where wins tells if
+            the move completes four in a row for the player.
+        """
+        if self.stale:
+            self.sync_bitboards()
+        mask = self.bitboards.get(chip, 0)
+        deltas = SCORE_DELTAS[CHIP_STEPS.get(chip, OTHER_CHIP_STEP)]
+        codes = self.window_codes
+        scores = []
+        for column in columns:
+            index = column * COLUMN_HEIGHT + self.heights[column]
+            score = self.heuristic_score
+            for window in CELL_WINDOWS[index]:
+                score += deltas[codes[window]]
+            scores.append((has_four(mask | 1 << index), score))
+        return scores
 
     def is_valid_location(self, column):
         """
@@ -68,7 +466,9 @@ class Board:
         Returns:
             bool: True if the column is valid, False otherwise.
         """
-        return self.board[0][column] == 0
+        if self.stale:
+            self.sync_bitboards()
+        return self.heights[column] < self.row_count
 
     def get_next_empty_row(self, column):
         """
@@ -80,11 +480,54 @@ class Board:
         Returns:
             int: The row index of the next available empty row in the column.
         """
-        for row in range(self.row_count-1, -1, -1):
-            if self.board[row][column] == 0:
-                return row
+        if self.stale:
+            self.sync_bitboards()
+        height = self.heights[column]
+        if height == self.row_count:
+            return None
+
+        return self.row_count - 1 - height
+
+    def position_key(self):
+        """
+        Get a compact key that identifies the position uniquely.
+
+        In every column the occupied cells plus the bottom cell add up to the bit just
+        above the topmost chip, and the chips of player 2 are added below that bit.
+        The key fits in 49 bits and, unlike the Zobrist hash, can be mirrored.
+
+        Returns:
+            int: The key of the position.
+        """
+        if self.stale:
+            self.sync_bitboards()
+        return self.bitboards[2] + self.occupied + BOTTOM_MASK
+
+    def empty_cell_count(self):
+        """
+        Count the empty cells left on the board.
+
+        Returns:
+            int: The number of empty cells.
+        """
+        if self.stale:
+            self.sync_bitboards()
+        return self.row_count * self.column_count - bin(self.occupied).count("1")
+
+    def winning_moves(self, chip):
+        """
+        Find the moves that would win the game at once for a player.
 
-        return None
+        Args:
+            chip (int): The player's chip (1 for red, 2 for yellow).
+
+        Returns:
+            int: A bitboard of the playable cells that complete four in a row for the
+            player, 0 if there are none.
+        """
+        if self.stale:
+            self.sync_bitboards()
+        return winning_cells(self.bitboards[chip], self.occupied) & playable_cells(self.occupied)
 
     def is_winner(self, last_row, last_col, player_id):
         """
@@ -98,40 +541,6 @@ class Board:
         Returns:
             boolean: True if the player has won, False otherwise.
         """
-        def check_direction(row_step, col_step):
-            count = 1  # Starts with 1 to count the last dropped chip itself.
-            # Check in the primary direction (forward)
-            row, col = last_row + row_step, last_col + col_step
-            while 0 <= row < self.row_count and 0 <= col < self.column_count \
-                and self.board[row][col] == player_id:
-                count += 1
-                row += row_step
-                col += col_step
-
-            # Check in the opposite direction (backward)
-            row, col = last_row - row_step, last_col - col_step
-            while 0 <= row < self.row_count and 0 <= col < self.column_count \
-                and self.board[row][col] == player_id:
-                count += 1
-                row -= row_step
-                col -= col_step
-
-            return count > 3
-
-        # Check horizontally
-        if check_direction(0, 1):
-            return True
-
-        # Check vertically
-        if check_direction(1, 0):
-            return True
-
-        # Check diagonally (positive slope)
-        if check_direction(1, 1):
-            return True
-
-        # Check diagonally (negative slope)
-        if check_direction(-1, 1):
-            return True
-
-        return False
+        if self.stale:
+            self.sync_bitboards()
+        return has_four(self.bitboards.get(player_id, 0) | cell_bit(last_row, last_col))
@@ -0,0 +1,234 @@
+"""
+Connect Four Opening Book Generator
+
+Enumerates the positions of the first moves breadth-first, searches every position
+where the AI (player 2) is to move in a pool of worker processes and merges the results
+into an opening book file. Results are written in checkpointed chunks, so running the
+same command again after an interruption resumes from the first missing chunk. The
+parameters of the run are kept in a manifest next to the chunks, and chunks made with
+other parameters are never resumed.
+
+Usage: python -m src.book_generator --max-ply 5 --depth 9
+"""
+
+import argparse
+import heapq
+import json
+import multiprocessing
+import os
+from .board import Board, mirror_key
+from .ai_player import AIPlayer
+from .opening_book import OpeningBook, write_book, DEFAULT_BOOK_PATH
+
+MANIFEST_NAME = "manifest.json"
+
+_worker_player = None  # AI player of a worker process, keeps its table between positions
+
+
+def enumerate_positions(max_ply):
+    """
+    Enumerate the positions reachable in at most max_ply moves, breadth-first.
+    Positions where a player has already won are left out, and a position and its
+    mirror image are counted only once.
+
+    Args:
+        max_ply (int): The number of moves made in the deepest positions.
+
+    Returns:
+        list: The positions as tuples of the columns played, with player 1 starting,
+        sorted by their position keys.
+    """
+    positions = {Board().position_key(): ()}
+    level = [()]
+    for ply in range(max_ply):
+        chip = 1 + ply % 2
+        next_level = []
+        for moves in level:
+            board = Board()
+            for move_ply, column in enumerate(moves):
+                board.play(column, 1 + move_ply % 2)
+            for column in range(board.column_count):
+                if not board.is_valid_location(column):
+                    continue
+                last_row = board.play(column, chip)
+                key = board.position_key()
+                canonical_key = min(key, mirror_key(key))
+                if canonical_key not in positions and not board.is_winner(last_row, column, chip):
+                    positions[canonical_key] = moves + (column,)
+                    next_level.append(moves + (column,))
+                board.undo()
+        level = next_level
+    return [positions[key] for key in sorted(positions)]
+
+
+def _init_worker():
+    global _worker_player  # pylint: disable=global-statement
+    _worker_player = AIPlayer(2)
+
+
+def search_position(task):
+    """
+    Search the best move of a position with iterative deepening up to a fixed depth.
+    The move is chosen the way the AI player chooses it in a game, and the score is read
+    back from the table the search filled.
+
+    Args:
+        task (tuple): The columns played to reach the position and the search depth.
+
+    Returns:
+        tuple: A book record (key, best_move, score) stored under the smaller of the
+        position key and its mirror image.
+    """
+    moves, depth = task
+    board = Board()
+    last_row = last_col = None
+    for ply, column in enumerate(moves):
+        last_row, last_col = board.play(column, 1 + ply % 2), column
+    # Minimax returns no move for a lost position, such as one with two threats to block
+    best_move = _worker_player.get_best_move(board, len(moves), start_depth=1,
+                                             max_depth=depth)
+    score = _worker_player.minimax(
+        board, depth, float("-inf"), float("inf"), True, len(moves), last_row, last_col)[1]
+    key = board.position_key()
+    mirrored = mirror_key(key)
+    if mirrored < key:
+        return mirrored, board.column_count - 1 - best_move, int(score)
+    return key, best_move, int(score)
+
+
+def chunk_path(work_dir, index):
+    """
+    Get the path of a result chunk.
+
+    Args:
+        work_dir (str): The directory of the chunks.
+        index (int): The index of the chunk.
+
+    Returns:
+        str: The path of the chunk file.
+    """
+    return os.path.join(work_dir, f"chunk_{index:05d}.bin")
+
+
+def prepare_work_dir(work_dir, parameters):
+    """
+    Create the directory of the chunks and write the parameters of the run to its
+    manifest, or check that the chunks already in it were made with the same
+    parameters.
+
+    Args:
+        work_dir (str): The directory of the chunks.
+        parameters (dict): The parameters that decide the contents of the chunks.
+
+    Raises:
+        ValueError: If the directory holds chunks made with other parameters, or
+        chunks without a manifest.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    path = os.path.join(work_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            manifest = json.load(file)
+        if manifest != parameters:
+            raise ValueError(
+                f"{work_dir} holds chunks made with {manifest}, not {parameters}. "
+                "Use another work directory or remove it.")
+        return
+    if any(name.startswith("chunk_") for name in os.listdir(work_dir)):
+        raise ValueError(
+            f"{work_dir} holds chunks without a manifest. "
+            "Use another work directory or remove it.")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(parameters, file)
+
+
+def generate_chunks(positions, depth, max_ply, work_dir, chunk_size, workers):
+    """
+    Search the positions in a process pool and write the results in sorted chunks.
+    Chunks that already exist are skipped.
+
+    Args:
+        positions (list): The positions to search, as tuples of the columns played.
+        depth (int): The search depth of every position.
+        max_ply (int): The deepest ply of the book.
+        work_dir (str): The directory of the chunks.
+        chunk_size (int): The number of positions in a chunk.
+        workers (int): The number of worker processes.
+
+    Returns:
+        list: The paths of all chunks.
+
+    Raises:
+        ValueError: If the work directory holds chunks made with other parameters.
+    """
+    prepare_work_dir(work_dir, {"max_ply": max_ply, "depth": depth,
+                                "chunk_size": chunk_size, "positions": len(positions)})
+    paths = []
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        for index, start in enumerate(range(0, len(positions), chunk_size)):
+            path = chunk_path(work_dir, index)
+            paths.append(path)
+            if os.path.exists(path):
+                continue
+            tasks = [(moves, depth) for moves in positions[start:start + chunk_size]]
+            records = sorted(pool.imap_unordered(search_position, tasks, chunksize=16))
+            # Write to a temporary file first so that an interrupted write is redone
+            write_book(path + ".tmp", records, max_ply)
+            os.replace(path + ".tmp", path)
+            print(f"Chunk {index + 1}/{-(-len(positions) // chunk_size)} done", flush=True)
+    return paths
+
+
+def merge_chunks(paths, output, max_ply):
+    """
+    Merge sorted chunks into one opening book file with a k-way merge.
+
+    Args:
+        paths (list): The paths of the chunks.
+        output (str): The path of the opening book file.
+        max_ply (int): The deepest ply of the book.
+
+    Returns:
+        int: The number of records in the opening book.
+    """
+    books = [OpeningBook(path) for path in paths]
+    try:
+        return write_book(output, heapq.merge(*(book.records() for book in books)), max_ply)
+    finally:
+        for book in books:
+            book.close()
+
+
+def main(argv=None):
+    """
+    Generate an opening book from the command line.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Generate a Connect Four opening book.")
+    parser.add_argument("--max-ply", type=int, default=5,
+                        help="number of moves made in the deepest book positions")
+    parser.add_argument("--depth", type=int, default=9, help="search depth per position")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="number of positions per checkpointed chunk")
+    parser.add_argument("--work-dir", default="book_chunks",
+                        help="directory of the checkpointed chunks")
+    parser.add_argument("--output", default=DEFAULT_BOOK_PATH, help="opening book file")
+    args = parser.parse_args(argv)
+
+    positions = [moves for moves in enumerate_positions(args.max_ply) if len(moves) % 2 == 1]
+    print(f"{len(positions)} positions to search", flush=True)
+    try:
+        paths = generate_chunks(positions, args.depth, args.max_ply, args.work_dir,
+                                args.chunk_size, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+    count = merge_chunks(paths, args.output, args.max_ply)
+    print(f"Wrote {count} positions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
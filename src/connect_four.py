@@ -1,17 +1,21 @@
 """
 Connect Four Main Game Module
+
+Run the game with `python -m src.connect_four`. Importing this module only defines the
+game, so that the AI worker processes and scripts that use the engine do not open a
+window.
 """
 
 # pylint: disable=no-member
 
+import os
+import sys
 import pygame
-from board import Board
-from player import Player
-from ai_player import AIPlayer
-from ui import draw_board, init_ui, draw_start_menu
-
-# Initialize pygame and set up window size
-pygame.init()
+from .board import Board
+from .player import Player
+from .ai_worker import AIWorker
+from .opening_book import OpeningBook, DEFAULT_BOOK_PATH
+from .ui import draw_board, init_ui, draw_start_menu, invalidate_board
 
 # Constants
 WINDOW_WIDTH = 700
@@ -19,138 +23,209 @@ WINDOW_HEIGHT = 700
 RED = (255, 0, 0)
 WHITE = (255, 255, 255)
 YELLOW = (255, 255, 0)
+FRAME_RATE = 60  # The most frames drawn per second
 
-# Create the window and initialize UI
-window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Connect Four")
-game_font = init_ui()
-
-# Create the board and players
-board = Board()
-player1 = Player(1)
-player2 = AIPlayer(2)
-current_player = player1
-
-# Main game loop
-running = True
-ai_thinking = False
-game_over = False  # Flag to indicate game over
-game_over_message = ""
-message_color = WHITE
-current_column = 0
-total_moves = 0
 
-
-def reset_game():
+class Game:  # pylint: disable=too-many-instance-attributes
     """
-    Reset the game state to start a new game.
+    Represents a game window where a human plays against the AI.
     """
-    global board, player1, player2, current_player, game_over, game_over_message, message_color
-    board = Board()  # Reset the game board
-    player1 = Player(1)  # Reinitialize player 1
-    player2 = AIPlayer(2)  # Reinitialize player 2
-    current_player = player1  # Reset the starting player
-    game_over = False  # Reset the game over flag
-    game_over_message = ""  # Clear any game over message
-    message_color = WHITE  # Reset the message color to default
-
 
-def show_start_menu():
-    """Show the start menu and wait for the user to select a control method.
-
-    Returns:
-        str: The control method selected by the user, either "mouse" or "keyboard".
-    """
-    control_method = None
-    while control_method is None:
-        draw_start_menu(window, game_font)
-        for menu_event in pygame.event.get():
+    def __init__(self):
+        """
+        Start the AI worker, initialize pygame and create the window.
+        """
+        # The AI searches in a background process, started before pygame so that the
+        # process does not inherit the window. It keeps its search results between
+        # games played in the same window, and answers early positions from the
+        # opening book if one has been generated
+        opening_book = OpeningBook() if os.path.exists(DEFAULT_BOOK_PATH) else None
+        self.ai_worker = AIWorker(2, keep_table_between_games=True, opening_book=opening_book)
+
+        pygame.init()
+        self.window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Connect Four")
+        self.game_font = init_ui()
+        self.clock = pygame.time.Clock()
+
+        self.player1 = Player(1)
+        self.player2 = Player(2)  # Moves of player 2 are searched by ai_worker
+        self.control = None
+        self.current_column = 0
+        self.drawn_state = None  # What the window shows, to redraw it only when it changes
+        self.reset_game()
+
+    def reset_game(self):
+        """
+        Reset the game state to start a new game.
+        """
+        self.board = Board()
+        self.ai_worker.new_game()  # Stop the AI search, but keep the AI player and its results
+        self.current_player = self.player1
+        self.total_moves = 0
+        self.game_over = False
+        self.game_over_message = ""
+        self.message_color = WHITE
+
+    def quit(self):
+        """
+        Stop the AI worker and close the window.
+        """
+        self.ai_worker.close()
+        pygame.quit()
+
+    def show_start_menu(self):
+        """
+        Show the start menu and wait for the user to select a control method.
+
+        Returns:
+            str: The control method selected by the user, either "mouse" or "keyboard".
+        """
+        draw_start_menu(self.window, self.game_font)
+        self.drawn_state = None  # The game has to be drawn again after the menu
+        control_method = None
+        while control_method is None:
+            # Sleep until something happens instead of drawing the same menu over and over
+            menu_event = pygame.event.wait()
             if menu_event.type == pygame.QUIT:
-                pygame.quit()
+                self.quit()
+                sys.exit()
             elif menu_event.type == pygame.KEYDOWN:
                 if menu_event.key == pygame.K_m:
                     control_method = "mouse"
                 elif menu_event.key == pygame.K_k:
                     control_method = "keyboard"
-    return control_method
-
-
-# Start the game and show the start menu
-control = show_start_menu()
-
-while running:
-    for event in pygame.event.get():
+            elif menu_event.type == pygame.VIDEOEXPOSE:
+                draw_start_menu(self.window, self.game_font)
+        return control_method
+
+    def play_human_move(self, column):
+        """
+        Drop a chip of the human player into a column, if the column has room.
+
+        Args:
+            column (int): The column selected by the human player.
+        """
+        if not self.board.is_valid_location(column):
+            return
+        last_row, last_col = self.board.drop_chip(column, self.player1.get_id())
+        self.total_moves += 1
+        if self.board.is_winner(last_row, last_col, self.player1.get_id()):
+            self.game_over_message = "Player 1 (Red) wins!"
+            self.message_color = RED
+            self.game_over = True
+        else:
+            self.current_player = self.player2
+
+    def play_ai_move(self):
+        """
+        Search the move of the AI in the background, and play it once the search is done.
+        """
+        if not self.ai_worker.searching and not self.ai_worker.ready:
+            self.ai_worker.start_search(self.board, self.total_moves)
+        if not self.ai_worker.poll():
+            return
+        best_move = self.ai_worker.take_move()
+        self.total_moves += 1
+        if best_move is None:
+            return
+        last_row, last_col = self.board.drop_chip(best_move, self.player2.get_id())
+        if self.board.is_winner(last_row, last_col, self.player2.get_id()):
+            self.game_over_message = "Player 2 (AI - Yellow) wins!"
+            self.message_color = YELLOW
+            self.game_over = True
+        elif self.total_moves == 42:  # Check if the board is full and call it a draw
+            self.game_over_message = "It's a draw!"
+            self.message_color = WHITE
+            self.game_over = True
+        else:
+            self.current_player = self.player1
+
+    def handle_event(self, event):
+        """
+        Handle one pygame event.
+
+        Args:
+            event (pygame.event.Event): The event to handle.
+
+        Returns:
+            bool: False if the window was closed, True otherwise.
+        """
+        human_to_move = self.current_player == self.player1 and not self.game_over
         if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.MOUSEBUTTONDOWN and current_player == player1 and not game_over:
-            column_clicked = event.pos[0] // 100
-            if board.is_valid_location(column_clicked):
-                last_row, last_col = board.drop_chip(
-                    column_clicked, player1.get_id())
-                draw_board(window, board, game_over_message if game_over else None,
-                           message_color, game_font, current_column, current_player)
-                total_moves += 1
-                if board.is_winner(last_row, last_col, player1.get_id()):
-                    game_over_message = "Player 1 (Red) wins!"
-                    message_color = RED
-                    game_over = True
-                else:
-                    current_player = player2
-                    ai_thinking = True
+            return False
+        if event.type == pygame.VIDEOEXPOSE:  # The window was uncovered
+            invalidate_board()
+            self.drawn_state = None
+        elif event.type == pygame.MOUSEBUTTONDOWN and human_to_move:
+            self.play_human_move(event.pos[0] // 100)
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_LEFT:  # Move selection left
-                current_column = max(0, current_column - 1)
+                self.current_column = max(0, self.current_column - 1)
             elif event.key == pygame.K_RIGHT:  # Move selection right
-                current_column = min(board.column_count -
-                                     1, current_column + 1)
-            elif event.key == pygame.K_SPACE and current_player == player1 and not game_over:
-                if board.is_valid_location(current_column):
-                    last_row, last_col = board.drop_chip(
-                        current_column, player1.get_id())
-                    draw_board(window, board, game_over_message if game_over else None,
-                               message_color, game_font, current_column, current_player)
-                    if board.is_winner(last_row, last_col, player1.get_id()):
-                        game_over_message = "Player 1 (Red) wins!"
-                        message_color = RED
-                        game_over = True
-                    else:
-                        current_player = player2
-                        ai_thinking = True
+                self.current_column = min(self.board.column_count - 1, self.current_column + 1)
+            elif event.key == pygame.K_SPACE and human_to_move:
+                self.play_human_move(self.current_column)
             elif event.key == pygame.K_r:  # Reset game
-                total_moves = 0
-                reset_game()
+                self.reset_game()
             elif event.key == pygame.K_m:  # Back to start menu
-                total_moves = 0
-                reset_game()
-                control = show_start_menu()
-
-    if current_player == player2 and ai_thinking and not game_over:
-        best_move = player2.get_best_move(board, total_moves)
-        total_moves += 1
-        if best_move is not None:
-            last_row, last_col = board.drop_chip(best_move, player2.get_id())
-            if board.is_winner(last_row, last_col, player2.get_id()):
-                game_over_message = "Player 2 (AI - Yellow) wins!"
-                message_color = YELLOW
-                game_over = True
-            elif total_moves == 42:  # Check if the board is full and call it a draw
-                game_over_message = "It's a draw!"
-                message_color = WHITE
-                game_over = True
-            else:
-                current_player = player1
-                ai_thinking = False
-
-    if control == "mouse":
-        x, _ = pygame.mouse.get_pos()
-        current_column = x // 100
-
-    draw_board(window, board, game_over_message if game_over else None,
-               message_color, game_font, current_column, current_player)
-
-    if game_over:
-        pygame.time.delay(3000)  # Show the game over message for 3 seconds
-        total_moves = 0
-        reset_game()  # Reset the game
-
-pygame.quit()
+                self.reset_game()
+                self.control = self.show_start_menu()
+        return True
+
+    def draw(self):
+        """
+        Redraw the window if the board, the hovered column, the player or the message
+        changed since it was last drawn.
+        """
+        message = self.game_over_message if self.game_over else None
+        state = (self.board.zobrist_hash, self.current_column,
+                 self.current_player.get_id(), message)
+        if state != self.drawn_state:
+            draw_board(self.window, self.board, message, self.message_color,
+                       self.game_font, self.current_column, self.current_player)
+            self.drawn_state = state
+
+    def run(self):
+        """
+        Show the start menu and run the game loop until the window is closed.
+        """
+        self.control = self.show_start_menu()
+        running = True
+        while running:
+            for event in pygame.event.get():
+                running = self.handle_event(event) and running
+
+            if self.current_player == self.player2 and not self.game_over:
+                # Search in the background and keep handling events and drawing until
+                # it is done
+                self.play_ai_move()
+
+            # Think about the answers to the human's moves while the human is thinking
+            if (self.current_player == self.player1 and not self.game_over
+                    and not self.ai_worker.pondering):
+                self.ai_worker.ponder(self.board, self.total_moves)
+
+            if self.control == "mouse":
+                x, _ = pygame.mouse.get_pos()
+                self.current_column = x // 100
+
+            self.draw()
+
+            if self.game_over:
+                pygame.time.delay(3000)  # Show the game over message for 3 seconds
+                self.reset_game()
+
+            self.clock.tick(FRAME_RATE)  # Sleep for the rest of the frame
+        self.quit()
+
+
+def main():
+    """
+    Open the game window and play until it is closed.
+    """
+    Game().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Connect Four Opening Book Module
+"""
+
+import mmap
+import os
+import struct
+from .board import COLUMN_COUNT, mirror_key
+
+MAGIC = b"C4BOOK1\0"
+# Magic, the deepest ply in the book and the number of records
+HEADER = struct.Struct("<8sII")
+# Position key, best column and score
+RECORD = struct.Struct("<Qii")
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+
+def write_book(path, records, max_ply):
+    """
+    Write an opening book file.
+
+    Args:
+        path (str): The path of the book file.
+        records (iterable): Tuples (key, best_move, score) in ascending key order, where
+        key is the `Board.position_key` of a position.
+        max_ply (int): The number of moves made in the deepest positions of the book.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    previous_key = -1
+    with open(path, "wb") as book_file:
+        book_file.write(HEADER.pack(MAGIC, max_ply, 0))
+        for key, best_move, score in records:
+            if key <= previous_key:
+                raise ValueError("Opening book records must be in ascending key order")
+            book_file.write(RECORD.pack(key, best_move, score))
+            previous_key = key
+            count += 1
+        book_file.seek(0)
+        book_file.write(HEADER.pack(MAGIC, max_ply, count))
+    return count
+
+
+class OpeningBook:
+    """
+    Represents a read-only opening book file mapped into memory.
+
+    The file holds records sorted by position key, which are found with binary search
+    directly in the mapped file, so only the pages touched by a lookup are read.
+    """
+
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        """
+        Open an opening book file.
+
+        Args:
+            path (str, optional): The path of the book file. Defaults to DEFAULT_BOOK_PATH.
+        """
+        self.path = path
+        with open(path, "rb") as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_ply, self.size = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or len(self.data) != HEADER.size + self.size * RECORD.size:
+            self.data.close()
+            raise ValueError(f"{path} is not an opening book file")
+
+    def __reduce__(self):
+        # A book sent to another process opens the same file there
+        return OpeningBook, (self.path,)
+
+    def close(self):
+        """
+        Close the book file.
+        """
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def probe(self, key):
+        """
+        Look up a position key with binary search.
+
+        Args:
+            key (int): The key of the position.
+
+        Returns:
+            tuple: A tuple (best_move, score) if the position is in the book.
+            Otherwise, None.
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            record_key, best_move, score = RECORD.unpack_from(
+                self.data, HEADER.size + middle * RECORD.size)
+            if record_key == key:
+                return best_move, score
+            if record_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def records(self):
+        """
+        Iterate over the records of the book in ascending key order.
+
+        Yields:
+            tuple: A tuple (key, best_move, score) for every record.
+        """
+        for index in range(self.size):
+            yield RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)
+
+    def lookup(self, board):
+        """
+        Look up the best move of a position, also when only its mirror image is stored.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+
+        Returns:
+            tuple: A tuple (best_move, score) if the position is in the book.
+            Otherwise, None.
+        """
+        if board.empty_cell_count() < board.row_count * board.column_count - self.max_ply:
+            return None
+        key = board.position_key()
+        result = self.probe(key)
+        if result is None:
+            result = self.probe(mirror_key(key))
+            if result is not None:
+                result = (COLUMN_COUNT - 1 - result[0], result[1])
+        return result
@@ -0,0 +1,276 @@
+"""
+Connect Four Parallel Search Module
+"""
+
+import multiprocessing
+from collections import Counter
+from .board import Board
+from .search_limits import SearchAborted, SharedCancelEvent
+
+CENTER_COLUMNS = [3, 2, 4, 1, 5, 0, 6]
+
+_worker_player = None  # AI player of a worker process, keeps its table between moves
+_worker_table_state = None  # Game and search the worker's table was last used in
+_shared_alpha = None  # Best root score proven so far in the current iteration
+_stopped_search = None  # Number of the last search of the main process that is over
+
+
+def _init_worker(player_class, table_size, shared_alpha):
+    global _worker_player, _shared_alpha  # pylint: disable=global-statement
+    _worker_player = player_class(2, table_size=table_size)
+    _shared_alpha = shared_alpha
+
+
+def search_root_move(task):
+    """
+    Search one root move, or one reply to a root move, in a worker process.
+
+    The search window starts just below the best root score finished so far, so moves
+    that can not beat it are cut off early while moves that tie it are still scored
+    exactly.
+
+    Args:
+        task (tuple): The board cells, the root column, the reply column or None, the
+        search depth of the root, the total number of moves made, the table state and
+        the deadline of the search.
+
+    Returns:
+        tuple: The root column, the minimax score of the searched move or None if the
+        search ran past the deadline, and the number of nodes searched.
+    """
+    global _worker_table_state  # pylint: disable=global-statement
+    cells, column, reply, depth, total_moves, table_state, deadline = task
+    table = _worker_player.transposition_table
+    if _worker_table_state is None or table_state[0] != _worker_table_state[0]:
+        table.clear()
+    if table_state != _worker_table_state:
+        table.new_search()
+        _worker_player.clear_move_ordering()
+        _worker_table_state = table_state
+
+    board = Board()
+    board.cells[:] = cells
+    board.sync_bitboards()
+    alpha = _shared_alpha.value - 1
+    _worker_player.deadline = deadline
+    node_start = _worker_player.node_count
+    last_row = board.play(column, 2)
+    try:
+        if reply is None:
+            score = _worker_player.minimax(
+                board, depth-1, alpha, float("inf"), False, total_moves+1, last_row, column)[1]
+        else:
+            last_row = board.play(reply, 1)
+            score = _worker_player.minimax(
+                board, depth-2, alpha, float("inf"), True, total_moves+2, last_row, reply)[1]
+    except SearchAborted:
+        score = None
+    return column, score, _worker_player.node_count - node_start
+
+
+class RootSearchPool:
+    """
+    Represents a pool of worker processes that search the root moves of a position in
+    parallel.
+
+    Each root move, or with `split_replies` each reply to a root move, is a separate
+    task. Every worker keeps its own transposition table between moves. When all
+    tasks of a root move are done, its score is shared with the workers, which start
+    the tasks they take next with that bound. The nodes searched by all workers are
+    counted in `node_count`.
+    """
+
+    def __init__(self, processes, player_class, table_size, split_replies=False):
+        """
+        Start the worker processes.
+
+        Args:
+            processes (int): The number of worker processes.
+            player_class (type): The AI player class the workers search with.
+            table_size (int): The number of slots in the table of each worker.
+            split_replies (bool, optional): Whether to search the replies to the root
+            moves as separate tasks. Defaults to False.
+        """
+        self.split_replies = split_replies
+        self.node_count = 0
+        self.shared_alpha = multiprocessing.Value("d", float("-inf"), lock=False)
+        self.pool = multiprocessing.Pool(  # pylint: disable=consider-using-with
+            processes, initializer=_init_worker,
+            initargs=(player_class, table_size, self.shared_alpha))
+
+    def search(self, board, valid_moves, depth, total_moves, table_state,
+               deadline=float("inf")):
+        """
+        Search the root moves of a position to a fixed depth.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            valid_moves (list): The columns to search, the most promising first.
+            depth (int): The search depth of the root.
+            total_moves (int): The total number of moves made in the game so far.
+            table_state (tuple): Identifies the game and the search, so that workers
+            clear or age their tables when they change.
+            deadline (float, optional): The time after which the workers abandon the
+            search. Defaults to no deadline.
+
+        Returns:
+            dict: The score of every root column. Scores below the best score may be
+            upper bounds only.
+
+        Raises:
+            SearchAborted: If the search runs past the deadline.
+        """
+        cells = board.cells.copy()
+        tasks = []
+        for column in valid_moves:
+            replies = [None]
+            if self.split_replies and depth > 1:
+                last_row = board.play(column, 2)
+                # A winning move ends the game, so it has no replies to split
+                if not board.is_winner(last_row, column, 2):
+                    replies = [
+                        reply for reply in CENTER_COLUMNS if board.is_valid_location(reply)
+                    ] or [None]
+                board.undo()
+            tasks.extend(
+                (cells, column, reply, depth, total_moves, table_state, deadline)
+                for reply in replies)
+
+        self.shared_alpha.value = float("-inf")
+        pending = Counter(task[1] for task in tasks)
+        scores = {}
+        aborted = False
+        for column, score, node_count in self.pool.imap_unordered(search_root_move, tasks):
+            self.node_count += node_count
+            if score is None:
+                aborted = True
+                continue
+            # The opponent picks the reply that is worst for the AI
+            scores[column] = min(scores.get(column, float("inf")), score)
+            pending[column] -= 1
+            if not pending[column] and scores[column] > self.shared_alpha.value:
+                self.shared_alpha.value = scores[column]
+        if aborted:
+            raise SearchAborted("The search ran past its deadline")
+        return scores
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        self.pool.terminate()
+        self.pool.join()
+
+
+def _init_helper(player_class, table, stopped_search):
+    global _worker_player, _stopped_search  # pylint: disable=global-statement
+    _worker_player = player_class(2, table_size=1)
+    _worker_player.transposition_table = table
+    _stopped_search = stopped_search
+
+
+def search_helper(task):
+    """
+    Search all root moves of a position in a helper process, only to fill the shared
+    transposition table. Helpers search the root moves in different orders so that
+    they visit different parts of the tree first.
+
+    Args:
+        task (tuple): The board cells, the search depth, the total number of moves
+        made, the table generation, the number of root moves to rotate the order by, the
+        deadline and the number of the search of the main process.
+    """
+    cells, depth, total_moves, generation, rotation, deadline, search_id = task
+    _worker_player.cancel_event = SharedCancelEvent(_stopped_search, search_id)
+    if _worker_player.cancel_event.is_set():
+        return  # The main search was over before the helper got to the task
+    _worker_player.transposition_table.generation = generation
+    _worker_player.deadline = deadline
+    board = Board()
+    board.cells[:] = cells
+    board.sync_bitboards()
+    columns = [column for column in CENTER_COLUMNS if board.is_valid_location(column)]
+    rotation %= len(columns)
+    try:
+        for column in columns[rotation:] + columns[:rotation]:
+            last_row = board.play(column, 2)
+            if not board.is_winner(last_row, column, 2):
+                _worker_player.minimax(
+                    board, depth-1, float("-inf"), float("inf"), False, total_moves+1,
+                    last_row, column)
+            board.undo()
+    except SearchAborted:
+        pass  # The main search is over, so the rest of the work would be wasted
+
+
+class LazySMPPool:
+    """
+    Represents helper processes for a lazy SMP search, where every process searches
+    the same position and they share one transposition table.
+
+    The main process runs iterative deepening as usual. At every iteration idle
+    helpers start searching the same position one or two plies deeper, so the table
+    fills up with results the main search can use. The main search never waits for
+    the helpers. The helpers stop at the deadline of the main search, or when the main
+    search is over and calls `stop`.
+    """
+
+    def __init__(self, helpers, player_class, table):
+        """
+        Start the helper processes.
+
+        Args:
+            helpers (int): The number of helper processes.
+            player_class (type): The AI player class the helpers search with.
+            table (SharedTranspositionTable): The table shared by all processes.
+        """
+        self.helpers = helpers
+        self.running = []
+        self.search_id = 1
+        self.stopped_search = multiprocessing.Value("q", 0, lock=False)
+        self.pool = multiprocessing.Pool(  # pylint: disable=consider-using-with
+            helpers, initializer=_init_helper,
+            initargs=(player_class, table, self.stopped_search))
+
+    def start(self, board, depth, total_moves, generation, deadline=float("inf")):
+        """
+        Give a search of the position to every idle helper, at staggered depths.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            depth (int): The depth the main process is about to search to.
+            total_moves (int): The total number of moves made in the game so far.
+            generation (int): The generation of the shared table of the current search.
+            deadline (float, optional): The time after which the helpers abandon the
+            search. Defaults to no deadline.
+        """
+        self.running = [result for result in self.running if not result.ready()]
+        cells = board.cells.copy()
+        for helper in range(self.helpers - len(self.running)):
+            task = (cells, depth + 1 + helper % 2, total_moves, generation, helper + 1,
+                    deadline, self.search_id)
+            self.running.append(self.pool.apply_async(search_helper, (task,)))
+
+    def stop(self):
+        """
+        Stop the searches the helpers have started or been given for the current
+        position, so they are idle for the next one.
+        """
+        self.stopped_search.value = self.search_id
+        self.search_id += 1
+        self.running = []
+
+    def wait(self):
+        """
+        Wait until the helpers have finished the searches they have started.
+        """
+        for result in self.running:
+            result.get()
+        self.running = []
+
+    def close(self):
+        """
+        Stop the helper processes.
+        """
+        self.pool.terminate()
+        self.pool.join()
@@ -0,0 +1,63 @@
+"""
+Connect Four Profile Summary
+
+Ranks the functions that took the most time in move profiles written by an AI player
+with `profile_dir` set, or with the CONNECT_FOUR_PROFILE_DIR environment variable. The
+profiles of several moves are added together.
+
+Usage: python -m src.profile_summary profiles/*.prof --limit 20
+"""
+
+import argparse
+import os
+import pstats
+
+# Functions of the engine that are always listed, even when they are not the hottest
+WATCHED_FUNCTIONS = ("heuristic_value", "evaluate_window", "copy", "is_winner", "minimax")
+
+
+def summarize(paths, limit=15):
+    """
+    Rank the functions of the profiles by the time spent in the function itself.
+
+    Args:
+        paths (list): The paths of the profile files.
+        limit (int, optional): The number of hottest functions to list. Watched
+        functions are listed after them even if they are not among the hottest.
+        Defaults to 15.
+
+    Returns:
+        list: Rows of (rank, function, calls, own seconds, cumulative seconds), the
+        hottest function first.
+    """
+    stats = pstats.Stats(*paths)
+    ranked = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    rows = []
+    for rank, ((path, line, name), (_, calls, own_time, total_time, _)) in enumerate(
+            ranked, start=1):
+        if rank <= limit or name in WATCHED_FUNCTIONS:
+            label = f"{os.path.basename(path)}:{line}({name})" if line else name
+            rows.append((rank, label, calls, own_time, total_time))
+    return rows
+
+
+def main(argv=None):
+    """
+    Print the summary of profiles from the command line.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Rank the hottest functions of profiles.")
+    parser.add_argument("paths", nargs="+", help="profile files to add together")
+    parser.add_argument("--limit", type=int, default=15,
+                        help="number of hottest functions to list")
+    args = parser.parse_args(argv)
+
+    print(f"{'rank':>4} {'calls':>10} {'own s':>9} {'total s':>9}  function")
+    for rank, label, calls, own_time, total_time in summarize(args.paths, args.limit):
+        print(f"{rank:>4} {calls:>10} {own_time:>9.4f} {total_time:>9.4f}  {label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Connect Four Search Limits Module
+"""
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside a search that has to stop before it finishes, for example because it
+    ran past its deadline. The search that raises it stores nothing for the unfinished
+    positions, so the transposition table stays valid.
+    """
+
+
+class SharedCancelEvent:  # pylint: disable=too-few-public-methods
+    """
+    Acts as the cancel event of a search run for another process. The other process
+    numbers its searches and cancels all searches up to a number at once by storing it
+    in a shared value, so searches it no longer waits for stop even if they have not
+    started yet.
+    """
+
+    def __init__(self, cancelled_id, search_id):
+        """
+        Initialize the cancel event of one search.
+
+        Args:
+            cancelled_id (multiprocessing.Value): The number of the last cancelled
+            search, shared between the processes.
+            search_id (int): The number of this search.
+        """
+        self.cancelled_id = cancelled_id
+        self.search_id = search_id
+
+    def is_set(self):
+        """
+        Check whether the search is cancelled.
+
+        Returns:
+            bool: True if the search or a later one was cancelled.
+        """
+        return self.cancelled_id.value >= self.search_id
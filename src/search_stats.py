@@ -0,0 +1,89 @@
+"""
+Connect Four Search Statistics Module
+"""
+
+
+class SearchStats:  # pylint: disable=too-many-instance-attributes
+    """
+    Represents the statistics of the search of one move: how deep and wide the search
+    went, how well the moves were ordered and how much the transposition table helped.
+
+    The counters are kept by the process running the search. The workers of a search
+    pool only add to the node count.
+    """
+
+    def __init__(self):
+        """
+        Initialize the statistics of a new search with all counters at zero.
+        """
+        self.depth = 0  # The deepest completed search depth
+        self.nodes = 0
+        self.leaves = 0  # Won, drawn and horizon positions evaluated without searching deeper
+        self.cutoffs = 0  # Nodes where a move reached beta
+        self.first_move_cutoffs = 0  # Cutoffs caused by the first move searched
+        self.table_probes = 0
+        self.table_hits = 0
+        self.table_stores = 0
+        self.iterations = []  # (depth, nodes, seconds) of every completed iteration
+        self.elapsed = 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        """
+        Get the share of cutoffs caused by the first move searched, which tells how
+        well the moves are ordered.
+
+        Returns:
+            float: The share between 0 and 1, or None if there were no cutoffs.
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else None
+
+    @property
+    def table_hit_rate(self):
+        """
+        Get the share of transposition table probes that found an entry.
+
+        Returns:
+            float: The share between 0 and 1, or None if the table was not probed.
+        """
+        return self.table_hits / self.table_probes if self.table_probes else None
+
+    @property
+    def effective_branching_factor(self):
+        """
+        Get the effective branching factor, the growth of the node count from the
+        second to last to the last completed iteration.
+
+        Returns:
+            float: The effective branching factor, or None if less than two iterations
+            with nodes were completed.
+        """
+        if len(self.iterations) < 2 or not self.iterations[-2][1]:
+            return None
+        return self.iterations[-1][1] / self.iterations[-2][1]
+
+    def as_dict(self):
+        """
+        Get the statistics as a dictionary, for structured logging.
+
+        Returns:
+            dict: The counters and the rates derived from them.
+        """
+        return {
+            "depth": self.depth,
+            "nodes": self.nodes,
+            "leaves": self.leaves,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "table_probes": self.table_probes,
+            "table_hits": self.table_hits,
+            "table_stores": self.table_stores,
+            "table_hit_rate": self.table_hit_rate,
+            "effective_branching_factor": self.effective_branching_factor,
+            "iterations": [
+                {"depth": depth, "nodes": nodes, "seconds": seconds}
+                for depth, nodes, seconds in self.iterations
+            ],
+            "elapsed": self.elapsed,
+        }
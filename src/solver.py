@@ -0,0 +1,180 @@
+"""
+Connect Four Endgame Solver Module
+"""
+
+from .board import (
+    ROW_COUNT, COLUMN_COUNT, COLUMN_HEIGHT, BOTTOM_MASK, playable_cells, winning_cells)
+
+CELL_COUNT = ROW_COUNT * COLUMN_COUNT
+CENTER_COLUMNS = [3, 2, 4, 1, 5, 0, 6]
+# The bits of a whole column, indexed by column
+COLUMN_MASKS = [((1 << ROW_COUNT) - 1) << (column * COLUMN_HEIGHT)
+                for column in range(COLUMN_COUNT)]
+DEFAULT_MAX_ENTRIES = 2 ** 20
+
+
+class Solver:
+    """
+    Represents an exact Connect Four solver for positions with few empty cells left.
+
+    The solver searches a compact position, the bitboard of the player to move and the
+    bitboard of all chips, with negamax and null-window searches. Scores count the
+    distance to the end: a win with the player's n:th last chip scores n, so quicker
+    wins score higher, a draw scores 0 and losses score negative.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, node_callback=None):
+        """
+        Initialize a solver.
+
+        Args:
+            max_entries (int, optional): The number of upper bounds the solver remembers
+            before its table is cleared.
+            node_callback (callable, optional): Called for every searched node. It may
+            raise an exception to stop the search, for example at a deadline. Defaults
+            to None.
+        """
+        self.max_entries = max_entries
+        self.table = {}
+        self.node_count = 0
+        self.node_callback = node_callback
+
+    def count_node(self):
+        """
+        Count a searched node and call the node callback, if there is one.
+        """
+        self.node_count += 1
+        if self.node_callback is not None:
+            self.node_callback()
+
+    def solve_board(self, board, chip):
+        """
+        Solve the best move for a player on a board.
+
+        Args:
+            board (Board): An instance of the game board representing the current game state.
+            chip (int): The chip of the player to move.
+
+        Returns:
+            tuple: The best column, its proven score and the number of nodes searched.
+            The column is None if the board is full.
+
+        Raises:
+            Exception: Whatever the node callback raises to stop the search.
+        """
+        current = board.bitboards.get(chip, 0)
+        occupied = board.occupied
+        moves = bin(occupied).count("1")
+        self.node_count = 0
+        wins = winning_cells(current, occupied) & playable_cells(occupied)
+        for column in CENTER_COLUMNS:
+            if wins & COLUMN_MASKS[column]:
+                self.count_node()
+                return column, (CELL_COUNT + 1 - moves) // 2, self.node_count
+
+        best_move, best_score = None, None
+        for column in CENTER_COLUMNS:
+            move = playable_cells(occupied) & COLUMN_MASKS[column]
+            if not move:
+                continue
+            # After the move the opponent is to move, and the score flips sign
+            score = -self.solve(current ^ occupied, occupied | move, moves + 1)
+            if best_score is None or score > best_score:
+                best_move, best_score = column, score
+        return best_move, best_score, self.node_count
+
+    def solve(self, current, occupied, moves):
+        """
+        Solve the score of a position by narrowing the score window with null-window
+        searches.
+
+        Args:
+            current (int): The bitboard of the player to move.
+            occupied (int): The bitboard of all chips on the board.
+            moves (int): The number of chips on the board.
+
+        Returns:
+            int: The proven score of the position for the player to move.
+        """
+        if winning_cells(current, occupied) & playable_cells(occupied):
+            self.count_node()
+            return (CELL_COUNT + 1 - moves) // 2
+        low = -((CELL_COUNT - moves) // 2)
+        high = (CELL_COUNT + 1 - moves) // 2
+        while low < high:
+            middle = low + (high - low) // 2
+            # Halve towards zero, so that the first searches tell wins from losses
+            if -(-low // 2) < middle <= 0:
+                middle = -(-low // 2)
+            elif 0 <= middle < high // 2:
+                middle = high // 2
+            score = self.negamax(current, occupied, moves, middle, middle + 1)
+            if score <= middle:
+                high = score
+            else:
+                low = score
+        return low
+
+    def negamax(self, current, occupied, moves, alpha, beta):  # pylint: disable=too-many-return-statements
+        """
+        Negamax search with alpha-beta pruning of a position where the player to move
+        can not win with their next chip.
+
+        Args:
+            current (int): The bitboard of the player to move.
+            occupied (int): The bitboard of all chips on the board.
+            moves (int): The number of chips on the board.
+            alpha (int): The score the player to move is already assured of.
+            beta (int): The score the opponent is already assured of.
+
+        Returns:
+            int: The score of the position, or a bound of it outside the window.
+        """
+        self.count_node()
+        playable = playable_cells(occupied)
+        opponent_wins = winning_cells(current ^ occupied, occupied)
+        forced = playable & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                return -((CELL_COUNT - moves) // 2)  # Two threats can not both be blocked
+            playable = forced
+        # Never play below a cell where the opponent would win
+        playable &= ~(opponent_wins >> 1)
+        if not playable:
+            return -((CELL_COUNT - moves) // 2)
+        if moves >= CELL_COUNT - 2:
+            return 0
+
+        lowest = -((CELL_COUNT - 2 - moves) // 2)
+        if alpha < lowest:
+            alpha = lowest
+            if alpha >= beta:
+                return alpha
+        highest = (CELL_COUNT - 1 - moves) // 2
+        key = current + occupied + BOTTOM_MASK
+        highest = min(highest, self.table.get(key, highest))
+        if beta > highest:
+            beta = highest
+            if alpha >= beta:
+                return beta
+
+        # Try first the moves that leave the most winning cells for the player
+        candidates = []
+        for column in CENTER_COLUMNS:
+            move = playable & COLUMN_MASKS[column]
+            if move:
+                threats = bin(winning_cells(current | move, occupied | move)).count("1")
+                candidates.append((-threats, len(candidates), move))
+        candidates.sort()
+
+        for _, _, move in candidates:
+            score = -self.negamax(
+                current ^ occupied, occupied | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+
+        if len(self.table) >= self.max_entries:
+            self.table.clear()
+        self.table[key] = alpha
+        return alpha
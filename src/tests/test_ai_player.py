@@ -2,8 +2,11 @@
 Test module for the AIPlayer class.
 """
 
+import random
+import threading
+import time
 import unittest
-from src.ai_player import AIPlayer
+from src.ai_player import AIPlayer, SearchAborted, DEADLINE_CHECK_INTERVAL, WIN_SCORE
 from src.board import Board
 
 
@@ -29,6 +32,275 @@ class TestAIPlayer(unittest.TestCase):
         self.assertEqual(
             best_move, 3, "AI should prefer the center column when the board is empty")
 
+    def test_transposition_table_is_kept_between_moves(self):
+        """
+        Test that the search results of a move are still in the table for the next move,
+        and that they are kept between games only when asked to.
+        """
+        self.board.drop_chip(3, 1)
+        self.ai_player.get_best_move(self.board, 1)
+        stored_entries = sum(
+            entry is not None for entry in self.ai_player.transposition_table.entries)
+        self.assertGreater(stored_entries, 0)
+        self.ai_player.new_game()
+        self.assertTrue(all(
+            entry is None for entry in self.ai_player.transposition_table.entries))
+
+        keeping_player = AIPlayer(2, keep_table_between_games=True)
+        keeping_player.get_best_move(self.board, 1)
+        keeping_player.new_game()
+        self.assertTrue(any(
+            entry is not None for entry in keeping_player.transposition_table.entries))
+
+    def test_search_leaves_board_unchanged(self):
+        """
+        Test that searching in place restores the board after every move it tries.
+        """
+        self.board.drop_chip(3, 1)
+        self.board.drop_chip(3, 2)
+        expected_board = self.board.board.copy()
+        expected_hash = self.board.zobrist_hash
+        self.ai_player.minimax(self.board, 4, float("-inf"), float("inf"), False, 2, 4, 3)
+        self.assertTrue((self.board.board == expected_board).all())
+        self.assertEqual(self.board.zobrist_hash, expected_hash)
+        self.assertEqual(self.board.history, [3, 3])
+
+    def test_iteration_is_abandoned_at_the_time_limit(self):
+        """
+        Test that a search is stopped in the middle of an iteration at the time limit,
+        and that the board is restored.
+        """
+        self.board.drop_chip(3, 1)
+        expected_board = self.board.board.copy()
+        time_start = time.time()
+        best_move = self.ai_player.get_best_move(self.board, 1, time_limit=0.2, start_depth=9)
+        self.assertLess(time.time() - time_start, 1)
+        self.assertTrue(self.board.is_valid_location(best_move))
+        self.assertTrue((self.board.board == expected_board).all())
+        self.assertEqual(self.board.history, [3])
+
+    def test_minimax_raises_after_deadline(self):
+        """
+        Test that minimax checks the deadline every DEADLINE_CHECK_INTERVAL nodes.
+        """
+        self.board.drop_chip(3, 1)
+        self.ai_player.deadline = time.time() - 1
+        self.ai_player.node_count = 0
+        with self.assertRaises(SearchAborted):
+            self.ai_player.minimax(self.board, 12, float("-inf"), float("inf"), True, 1, 5, 3)
+        self.assertEqual(self.ai_player.node_count, DEADLINE_CHECK_INTERVAL)
+
+    def test_fixed_depth_is_reproducible(self):
+        """
+        Test that a fixed-depth search always gives the same move and node count, and
+        reports them.
+        """
+        self.board.drop_chip(3, 1)
+        self.board.drop_chip(3, 2)
+        results = []
+        for _ in range(2):
+            player = AIPlayer(2)
+            best_move = player.get_best_move(self.board, 2, max_depth=5)
+            self.assertEqual(player.last_result.move, best_move)
+            self.assertEqual(player.last_result.depth, 5)
+            self.assertGreater(player.last_result.nodes, 0)
+            self.assertGreaterEqual(player.last_result.elapsed, 0)
+            results.append(player.last_result[:3])
+        self.assertEqual(results[0], results[1])
+
+    def test_node_budget(self):
+        """
+        Test that a search stops at its node budget with the move of the last completed
+        iteration, the same way every time.
+        """
+        self.board.drop_chip(3, 1)
+        results = []
+        for _ in range(2):
+            player = AIPlayer(2)
+            player.get_best_move(self.board, 1, node_budget=3000)
+            self.assertEqual(player.last_result.nodes, 3000)
+            self.assertGreaterEqual(player.last_result.depth, 3)
+            results.append(player.last_result[:3])
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(self.board.history, [3])
+
+        pool_player = AIPlayer(2, processes=1)
+        try:
+            with self.assertRaises(ValueError):
+                pool_player.get_best_move(self.board, 1, node_budget=3000)
+        finally:
+            pool_player.close()
+
+    def test_search_stats(self):
+        """
+        Test that the statistics of a search are kept after get_best_move.
+        """
+        for column, chip in [(3, 1), (3, 2), (2, 1)]:
+            self.board.play(column, chip)
+        self.ai_player.get_best_move(self.board, 3, max_depth=6)
+        stats = self.ai_player.last_result.stats
+        self.assertIs(stats, self.ai_player.stats)
+        self.assertEqual(stats.depth, 6)
+        self.assertEqual(stats.nodes, self.ai_player.last_result.nodes)
+        self.assertEqual([depth for depth, _, _ in stats.iterations], [3, 4, 5, 6])
+        self.assertEqual(sum(nodes for _, nodes, _ in stats.iterations), stats.nodes)
+        self.assertGreater(stats.leaves, 0)
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertLessEqual(stats.first_move_cutoffs, stats.cutoffs)
+        self.assertGreater(stats.table_hits, 0)
+        self.assertLessEqual(stats.table_hits, stats.table_probes)
+        self.assertGreater(stats.table_stores, 0)
+        self.assertIsNotNone(stats.effective_branching_factor)
+
+    def test_search_stats_are_logged(self):
+        """
+        Test that the statistics are logged as a structured record when asked to.
+        """
+        player = AIPlayer(2, log_stats=True)
+        self.board.play(3, 1)
+        with self.assertLogs("src.ai_player", level="INFO") as logs:
+            move = player.get_best_move(self.board, 1, max_depth=4)
+        record = logs.records[0].search_stats
+        self.assertEqual(record["depth"], 4)
+        self.assertEqual(record["nodes"], player.last_result.nodes)
+        self.assertIn(f'"move": {move}', logs.output[0])
+
+    def test_killer_and_history_ordering(self):
+        """
+        Test that moves that caused cutoffs are searched early: the killer moves of the
+        ply first, then the others by their history scores.
+        """
+        self.ai_player.record_cutoff(1, 6, 5, 4, 2)
+        self.ai_player.record_cutoff(1, 0, 5, 2, 5)
+        self.assertEqual(self.ai_player.order_moves(self.board, None, 1, 2),
+                         [6, 0, 3, 2, 4, 1, 5])
+        self.ai_player.record_cutoff(1, 5, 5, 2, 2)
+        self.assertEqual(self.ai_player.order_moves(self.board, 3, 1, 2),
+                         [3, 5, 6, 0, 2, 4, 1])
+        # The history of the other player and the plain order are not affected
+        self.assertEqual(self.ai_player.order_moves(self.board, None, 2, 3),
+                         [3, 2, 4, 1, 5, 0, 6])
+        self.assertEqual(self.ai_player.order_moves(self.board, None),
+                         [3, 2, 4, 1, 5, 0, 6])
+
+    def test_move_ordering_kept_between_iterations(self):
+        """
+        Test that the killer moves and history scores are kept through the iterations
+        of a search, and forgotten when the next move is searched.
+        """
+        self.board.play(3, 1)
+        self.ai_player.get_best_move(self.board, 1, max_depth=6)
+        history = self.ai_player.history
+        self.assertGreater(sum(map(sum, history[1] + history[2])), 0)
+        self.assertTrue(any(killers[0] is not None for killers in self.ai_player.killer_moves))
+        self.board.play(3, 2)
+        self.board.play(2, 1)
+        self.ai_player.get_best_move(self.board, 3, max_depth=2)
+        self.assertIsNot(self.ai_player.history, history)
+
+    def test_forced_block_is_the_only_move_searched(self):
+        """
+        Test that a single threat of the opponent is blocked without searching the
+        other moves, at the root and inside the search.
+        """
+        for column, chip in [(0, 1), (0, 2), (1, 1), (1, 2), (2, 1)]:
+            last_row = self.board.play(column, chip)
+        self.assertEqual(self.ai_player.get_best_move(self.board, 5), 3)
+        self.assertEqual(self.ai_player.last_result.nodes, 0)
+
+        node_start = self.ai_player.node_count
+        move, _ = self.ai_player.minimax(
+            self.board, 2, float("-inf"), float("inf"), True, 5, last_row, 2)
+        self.assertEqual(move, 3)
+        self.assertEqual(self.ai_player.node_count - node_start, 2)
+
+    def test_double_threat_scored_as_loss(self):
+        """
+        Test that two threats of the opponent are scored as a loss without searching,
+        and an immediate win is taken before blocking.
+        """
+        for column, chip in [(2, 1), (2, 2), (3, 1), (3, 2), (4, 1)]:
+            last_row = self.board.play(column, chip)
+        node_start = self.ai_player.node_count
+        _, value = self.ai_player.minimax(
+            self.board, 1, float("-inf"), float("inf"), True, 5, last_row, 4)
+        self.assertEqual(value, -(WIN_SCORE + self.board.empty_cell_count() - 2))
+        self.assertEqual(self.ai_player.node_count - node_start, 1)
+
+        for column, chip in [(4, 2), (0, 1), (4, 2)]:
+            last_row = self.board.play(column, chip)
+        move, value = self.ai_player.minimax(
+            self.board, 3, float("-inf"), float("inf"), False, 8, last_row, 4)
+        self.assertEqual(move, 1)  # Player 1 wins at once instead of searching
+        self.assertEqual(value, -(WIN_SCORE + self.board.empty_cell_count() - 1))
+
+    def test_pondered_answer_is_reused(self):
+        """
+        Test that the answer to the opponent's move found while pondering is returned
+        without searching again, and that the other answers are dropped.
+        """
+        self.board.drop_chip(3, 1)
+        self.board.drop_chip(3, 2)
+        self.ai_player.ponder(self.board, 2, max_depth=4)
+        self.assertEqual(len(self.ai_player.ponder_answers), 7)
+
+        self.board.drop_chip(2, 1)
+        pondered = self.ai_player.ponder_answers[self.board.position_key()]
+        node_count = self.ai_player.node_count
+        self.assertEqual(self.ai_player.get_best_move(self.board, 3), pondered.move)
+        self.assertIs(self.ai_player.last_result, pondered)
+        self.assertEqual(self.ai_player.node_count, node_count)
+        self.assertEqual(self.ai_player.ponder_answers, {})
+        self.assertEqual(self.board.history, [3, 3, 2])
+
+    def test_cancelled_pondering_keeps_no_answer(self):
+        """
+        Test that pondering stops when it is cancelled.
+        """
+        cancel_event = threading.Event()
+        cancel_event.set()
+        self.ai_player.cancel_event = cancel_event
+        self.ai_player.ponder(self.board, 0, max_depth=8)
+        self.assertEqual(self.ai_player.ponder_answers, {})
+        self.assertEqual(self.board.history, [])
+
+    def test_solver_is_used_near_the_end(self):
+        """
+        Test that positions with few empty cells are solved exactly, and searched
+        otherwise.
+        """
+        for column in range(5):
+            for row in range(6):
+                self.board.drop_chip(column, 1 + (row // 2 + column) % 2)
+        best_move = self.ai_player.get_best_move(self.board, 30)
+        self.assertIn(best_move, (5, 6))
+        score, node_count = self.ai_player.last_solution
+        self.assertEqual(score, 0)
+        self.assertGreater(node_count, 0)
+
+        searching_player = AIPlayer(2, solver_threshold=0)
+        self.assertIn(searching_player.get_best_move(self.board, 30), (5, 6))
+        self.assertIsNone(searching_player.last_solution)
+
+    def test_solver_keeps_to_the_search_limits(self):
+        """
+        Test that the solver is skipped when the depth limit does not reach the end of
+        the game, and stops at the node budget like the search.
+        """
+        for column in range(5):
+            for row in range(6):
+                self.board.drop_chip(column, 1 + (row // 2 + column) % 2)
+        shallow_player = AIPlayer(2)
+        self.assertIn(shallow_player.get_best_move(self.board, 30, max_depth=1), (5, 6))
+        self.assertIsNone(shallow_player.last_solution)
+        self.assertEqual(shallow_player.last_result.depth, 1)
+
+        budget_player = AIPlayer(2)
+        self.assertIn(budget_player.get_best_move(self.board, 30, node_budget=50), (5, 6))
+        self.assertIsNone(budget_player.last_solution)
+        self.assertEqual(budget_player.last_result.nodes, 50)
+        self.assertEqual(self.board.empty_cell_count(), 12)
+
     def test_winning_move_identifying(self):
         """
         Test if the AI correctly identifies and makes a winning move.
@@ -244,6 +516,32 @@ class TestAIPlayer(unittest.TestCase):
         self.assertGreater(heuristic_value_after, heuristic_value_before,
                            "Heuristic should value blocking opponent's winning moves positively.")
 
+    def test_incremental_heuristic_matches_heuristic_value(self):
+        """
+        Test that the heuristic score kept by the board matches a full board scan
+        after every move and undo of random games.
+        """
+        generator = random.Random(42)
+        for _ in range(20):
+            board = Board()
+            for move in range(generator.randint(1, 42)):
+                columns = [col for col in range(7) if board.is_valid_location(col)]
+                board.play(generator.choice(columns), 1 + move % 2)
+                self.assertEqual(board.heuristic_score, self.ai_player.heuristic_value(board))
+            while board.undo() is not None:
+                self.assertEqual(board.heuristic_score, self.ai_player.heuristic_value(board))
+
+    def test_incremental_heuristic_after_direct_edit(self):
+        """
+        Test that the heuristic score is rebuilt after the board array is edited directly.
+        """
+        self.board.board[5][2] = self.board.board[5][3] = self.board.board[5][4] = 2
+        self.board.board[4][2] = -1  # -1 is a placeholder for any chip
+        # Any board operation rebuilds the state of a stale board
+        self.assertEqual(self.board.empty_cell_count(), 38)
+        self.assertEqual(self.board.heuristic_score,
+                         self.ai_player.heuristic_value(self.board))
+
     def test_five_moves_away_from_a_win(self):
         """
         Test the AI's decision making when it is five moves away from a win.
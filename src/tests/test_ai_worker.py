@@ -0,0 +1,101 @@
+"""
+Test module for the AIWorker class.
+"""
+
+import subprocess
+import sys
+import time
+import unittest
+from src.ai_worker import AIWorker
+from src.board import Board
+
+
+class TestAIWorker(unittest.TestCase):
+    """
+    Test the AIWorker class and its methods in different scenarios.
+    """
+
+    def setUp(self):
+        self.worker = AIWorker(2)
+        self.board = Board()
+
+    def tearDown(self):
+        self.worker.close()
+
+    def test_search_in_background(self):
+        """
+        Test that a search started in the background finds the winning move, and that
+        the board can be changed while it runs.
+        """
+        for _ in range(3):
+            self.board.drop_chip(3, 2)
+        self.worker.start_search(self.board, 3)
+        self.board.drop_chip(3, 1)
+        self.assertTrue(self.worker.poll(timeout=10))
+        self.assertEqual(self.worker.take_move(), 3)
+        self.assertFalse(self.worker.poll())
+
+    def test_cancel(self):
+        """
+        Test that a cancelled search is stopped quickly and its result is never returned.
+        """
+        self.worker.start_search(self.board, 0, time_limit=5, start_depth=12)
+        time.sleep(0.2)
+        self.worker.cancel()
+        self.assertFalse(self.worker.poll())
+
+        time_start = time.time()
+        self.board.drop_chip(0, 2)
+        self.board.drop_chip(0, 2)
+        self.board.drop_chip(0, 2)
+        self.worker.start_search(self.board, 3)
+        self.assertTrue(self.worker.poll(timeout=10))
+        self.assertEqual(self.worker.take_move(), 0)
+        self.assertLess(time.time() - time_start, 2)
+
+    def test_pondered_answer_is_instant(self):
+        """
+        Test that a search of a pondered position is answered without searching.
+        """
+        self.board.drop_chip(3, 1)
+        self.board.drop_chip(3, 2)
+        self.worker.ponder(self.board, 2, max_depth=4)
+        self.assertTrue(self.worker.pondering)
+        time.sleep(1)  # Give the worker time to answer every move
+        self.board.drop_chip(4, 1)
+        self.worker.start_search(self.board, 3, max_depth=4)
+        self.assertFalse(self.worker.pondering)
+        self.assertTrue(self.worker.poll(timeout=0.5))
+        self.assertTrue(self.board.is_valid_location(self.worker.take_move()))
+
+    def test_cancel_before_worker_reads_request(self):
+        """
+        Test that pondering cancelled before the busy worker reads the request never
+        starts, so the next search is answered at once.
+        """
+        self.worker.start_search(self.board, 0, time_limit=5, start_depth=12)
+        self.worker.ponder(self.board, 0, max_depth=20)
+        self.worker.cancel()
+
+        for _ in range(3):
+            self.board.drop_chip(3, 2)
+        self.worker.start_search(self.board, 3)
+        self.assertTrue(self.worker.poll(timeout=2))
+        self.assertEqual(self.worker.take_move(), 3)
+
+    def test_new_game_cancels_search(self):
+        """
+        Test that a new game cancels the search in progress.
+        """
+        self.worker.start_search(self.board, 0, time_limit=5)
+        self.worker.new_game()
+        self.assertFalse(self.worker.searching)
+        self.assertFalse(self.worker.poll(timeout=0.5))
+
+    def test_engine_does_not_import_pygame(self):
+        """
+        Test that the engine, and the worker that runs it, can be imported without
+        pygame.
+        """
+        code = "import sys, src.ai_worker; sys.exit('pygame' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, "-c", code], check=False).returncode, 0)
@@ -0,0 +1,64 @@
+"""
+Test module for the engine benchmark.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from src.benchmark import CORPUS, load_position, compare, main
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Test the engine benchmark in different scenarios.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.output = os.path.join(self.directory, "benchmark.json")
+
+    def test_corpus_positions_are_playable(self):
+        """
+        Test that every corpus position is legal, undecided and has the AI to move.
+        """
+        self.assertEqual({category for category, _ in CORPUS.values()},
+                         {"opening", "middlegame", "near-endgame", "tactical"})
+        for _, moves in CORPUS.values():
+            self.assertEqual(len(moves) % 2, 1)
+            board, last_row, last_col = load_position(moves)
+            self.assertFalse(board.is_winner(last_row, last_col, 1))
+            self.assertEqual(board.history, moves)
+
+    def test_compare_flags_regressions(self):
+        """
+        Test that only metrics that got worse by more than the tolerance are flagged.
+        """
+        baseline = {"positions": {"a": {"minimax_nodes_per_sec": 1000,
+                                        "get_best_move_seconds": 1.0,
+                                        "peak_memory_bytes": 100}}}
+        results = {"positions": {"a": {"minimax_nodes_per_sec": 850,
+                                       "get_best_move_seconds": 0.5,
+                                       "peak_memory_bytes": 105},
+                                 "b": {"minimax_nodes_per_sec": 1}}}
+        regressions = compare(results, baseline, 0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("minimax_nodes_per_sec", regressions[0])
+
+    def test_benchmark_writes_and_compares_results(self):
+        """
+        Test that results are written as JSON and compare cleanly against themselves.
+        """
+        arguments = ["--depth", "2", "--calls", "5", "--repeat", "1",
+                     "--positions", "opening_three", "tactical_win"]
+        self.assertEqual(main(arguments + ["--output", self.output]), 0)
+        with open(self.output, encoding="utf-8") as file:
+            results = json.load(file)
+        metrics = results["positions"]["opening_three"]
+        self.assertEqual(metrics["category"], "opening")
+        self.assertEqual(set(metrics["time_to_depth"]), {"1", "2"})
+        self.assertGreater(metrics["minimax_nodes"], 0)
+        self.assertGreater(metrics["peak_memory_bytes"], 0)
+        self.assertEqual(main(arguments + ["--compare", self.output, "--tolerance", "1e9"]), 0)
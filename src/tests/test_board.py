@@ -4,7 +4,7 @@ Test module for the Board class.
 
 import unittest
 import numpy as np
-from src.board import Board
+from src.board import Board, cell_bit, cell_column, has_four, mirror_key
 
 
 class TestBoard(unittest.TestCase):
@@ -134,3 +134,159 @@ class TestBoard(unittest.TestCase):
             last_row, last_col = board.drop_chip(i, 1)
         self.assertTrue(board.is_winner(last_row, last_col, 1),
                         "Expected a negative diagonal win for player 1")
+
+    def test_drop_chip_updates_bitboards(self):
+        """
+        Test that drop_chip keeps the bitboards and column heights in sync.
+        """
+        board = Board()
+        board.drop_chip(3, 1)
+        board.drop_chip(3, 2)
+        self.assertEqual(board.heights[3], 2)
+        self.assertEqual(board.bitboards[1], cell_bit(5, 3))
+        self.assertEqual(board.bitboards[2], cell_bit(4, 3))
+        self.assertEqual(board.occupied, cell_bit(5, 3) | cell_bit(4, 3))
+
+    def test_play_and_undo(self):
+        """
+        Test that undo takes back the moves made with play and drop_chip in reverse order.
+        """
+        board = Board()
+        board.drop_chip(3, 1)
+        self.assertEqual(board.play(3, 2), 4)
+        self.assertEqual(board.play(0, 1), 5)
+        self.assertEqual(board.history, [3, 3, 0])
+        self.assertEqual(board.undo(), (5, 0))
+        self.assertEqual(board.undo(), (4, 3))
+        self.assertEqual(board.board[4][3], 0)
+        self.assertEqual(board.bitboards[2], 0)
+        self.assertEqual(board.heights[3], 1)
+        self.assertEqual(board.undo(), (5, 3))
+        self.assertEqual(board.undo(), None)
+        self.assertEqual(board.occupied, 0)
+
+    def test_direct_array_edit_is_synced(self):
+        """
+        Test that chips written directly into the array are seen by the bitboards.
+        """
+        board = Board()
+        board.board[5][0] = board.board[5][1] = board.board[5][2] = 1
+        self.assertEqual(board.get_next_empty_row(1), 4)
+        last_row, last_col = board.drop_chip(3, 1)
+        self.assertTrue(board.is_winner(last_row, last_col, 1))
+
+    def test_writing_a_copy_keeps_the_board(self):
+        """
+        Test that writing into a copy of the array, or into the result of a comparison,
+        leaves the board and its history alone.
+        """
+        board = Board()
+        board.play(3, 1)
+        board.play(3, 2)
+        cells = board.board.copy()
+        cells[0][0] = 1
+        chips = board.board == 1
+        chips[0][0] = True
+        self.assertFalse(board.stale)
+        self.assertEqual(board.undo(), (4, 3))
+        self.assertEqual(board.history, [3])
+
+    def test_has_four(self):
+        """
+        Test the has_four function with all four line directions.
+        """
+        self.assertTrue(has_four(sum(cell_bit(5, col) for col in range(4))))
+        self.assertTrue(has_four(sum(cell_bit(row, 0) for row in range(4))))
+        self.assertTrue(has_four(sum(cell_bit(5 - i, i) for i in range(4))))
+        self.assertTrue(has_four(sum(cell_bit(i, i) for i in range(4))))
+        # Chips wrapping from the bottom of one column to the top of the next are not a line
+        self.assertFalse(
+            has_four(cell_bit(1, 0) | cell_bit(0, 0) | cell_bit(5, 1) | cell_bit(4, 1)))
+
+    def test_zobrist_hash_is_restored_after_undo(self):
+        """
+        Test that undoing a move restores the Zobrist hash of the previous position.
+        """
+        board = Board()
+        board.drop_chip(3, 1)
+        hash_before = board.zobrist_hash
+        board.drop_chip(4, 2)
+        self.assertNotEqual(board.zobrist_hash, hash_before)
+        board.undo()
+        self.assertEqual(board.zobrist_hash, hash_before)
+
+    def test_zobrist_hash_of_transposed_moves(self):
+        """
+        Test that the same position reached in a different move order has the same hash.
+        """
+        board = Board()
+        other_board = Board()
+        for column, chip in [(3, 1), (2, 2), (4, 1)]:
+            board.drop_chip(column, chip)
+        for column, chip in [(4, 1), (2, 2), (3, 1)]:
+            other_board.drop_chip(column, chip)
+        self.assertEqual(board.zobrist_hash, other_board.zobrist_hash)
+
+        other_board.board[5][0] = 2
+        other_board.sync_bitboards()
+        board.drop_chip(0, 2)
+        self.assertEqual(board.zobrist_hash, other_board.zobrist_hash)
+
+    def test_empty_cell_count(self):
+        """
+        Test the empty_cell_count method.
+        """
+        board = Board()
+        self.assertEqual(board.empty_cell_count(), 42)
+        board.drop_chip(3, 1)
+        board.board[5][0] = 2
+        self.assertEqual(board.empty_cell_count(), 40)
+
+    def test_winning_moves(self):
+        """
+        Test that only the playable cells that complete four in a row are found.
+        """
+        board = Board()
+        for column, chip in [(2, 1), (2, 2), (3, 1), (3, 2), (4, 1)]:
+            board.play(column, chip)
+        self.assertEqual(board.winning_moves(1), cell_bit(5, 1) | cell_bit(5, 5))
+        self.assertEqual(board.winning_moves(2), 0)
+        self.assertEqual(cell_column(board.winning_moves(1)), 1)
+        board.play(1, 2)
+        board.play(5, 2)
+        # The cells above the second row threat of player 2 are not playable yet
+        self.assertEqual(board.winning_moves(2), 0)
+        self.assertEqual(board.winning_moves(1), 0)
+
+    def test_score_moves(self):
+        """
+        Test that score_moves matches the state after playing each move.
+        """
+        board = Board()
+        for column in [3, 3, 2, 4, 2, 0, 1]:
+            board.drop_chip(column, 1 if board.empty_cell_count() % 2 == 0 else 2)
+        columns = [3, 2, 4, 1, 5, 0, 6]
+        for chip in (1, 2):
+            for column, (wins, score) in zip(columns, board.score_moves(columns, chip)):
+                last_row = board.play(column, chip)
+                self.assertEqual(wins, board.is_winner(last_row, column, chip))
+                self.assertEqual(score, board.heuristic_score)
+                board.undo()
+
+    def test_position_key(self):
+        """
+        Test that position keys tell apart chips of different players and mirror correctly.
+        """
+        board = Board()
+        other_board = Board()
+        board.drop_chip(0, 1)
+        board.drop_chip(0, 2)
+        other_board.drop_chip(0, 2)
+        other_board.drop_chip(0, 1)
+        self.assertNotEqual(board.position_key(), other_board.position_key())
+        self.assertNotEqual(board.position_key(), Board().position_key())
+
+        mirrored_board = Board()
+        mirrored_board.drop_chip(6, 1)
+        mirrored_board.drop_chip(6, 2)
+        self.assertEqual(mirror_key(board.position_key()), mirrored_board.position_key())
@@ -0,0 +1,85 @@
+"""
+Test module for the opening book generator.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from src.board import Board, mirror_key
+from src.opening_book import OpeningBook, write_book
+from src.book_generator import (
+    enumerate_positions, chunk_path, prepare_work_dir, main, MANIFEST_NAME)
+
+
+class TestBookGenerator(unittest.TestCase):
+    """
+    Test the opening book generator in different scenarios.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.work_dir = os.path.join(self.directory, "chunks")
+        self.output = os.path.join(self.directory, "book.bin")
+
+    def test_enumerate_positions_removes_mirror_images(self):
+        """
+        Test that mirrored positions are enumerated only once.
+        """
+        positions = enumerate_positions(1)
+        self.assertEqual(len(positions), 5)  # The empty board and four distinct first moves
+        # 49 two-move positions, of which only both chips in the middle column is symmetric
+        self.assertEqual(len(enumerate_positions(2)), 5 + 25)
+
+    def test_generate_book(self):
+        """
+        Test that the generated book answers every position where the AI is to move,
+        and the mirrored ones too.
+        """
+        main(["--max-ply", "5", "--depth", "2", "--workers", "1", "--chunk-size", "1000",
+              "--work-dir", self.work_dir, "--output", self.output])
+        with OpeningBook(self.output) as book:
+            self.assertEqual(book.max_ply, 5)
+            keys = [key for key, _, _ in book.records()]
+            self.assertEqual(keys, sorted(keys))
+            # Player 1 has two threats after (1, 6, 2, 6, 3), so every move loses
+            for moves in [(0,), (6,), (3, 3, 2), (4, 3, 3), (1, 6, 2, 6, 3)]:
+                board = Board()
+                for ply, column in enumerate(moves):
+                    board.drop_chip(column, 1 + ply % 2)
+                best_move, _ = book.lookup(board)
+                self.assertTrue(board.is_valid_location(best_move))
+
+    def test_resume_keeps_finished_chunks(self):
+        """
+        Test that chunks written by an earlier run are not searched again.
+        """
+        arguments = ["--max-ply", "1", "--depth", "2", "--workers", "1", "--chunk-size", "10",
+                     "--work-dir", self.work_dir, "--output", self.output]
+        main(arguments)
+        board = Board()
+        board.drop_chip(0, 1)
+        key = min(board.position_key(), mirror_key(board.position_key()))
+        write_book(chunk_path(self.work_dir, 0), [(key, 5, 12345)], 1)
+        main(arguments)
+        with OpeningBook(self.output) as book:
+            self.assertEqual(list(book.records()), [(key, 5, 12345)])
+
+    def test_resume_refuses_other_parameters(self):
+        """
+        Test that chunks made with other parameters, or without a manifest, are not
+        merged into the book.
+        """
+        main(["--max-ply", "1", "--depth", "2", "--workers", "1", "--chunk-size", "10",
+              "--work-dir", self.work_dir, "--output", self.output])
+        with self.assertRaises(ValueError):
+            prepare_work_dir(self.work_dir, {"max_ply": 1, "depth": 3, "chunk_size": 10,
+                                             "positions": 4})
+        with self.assertRaises(SystemExit):
+            main(["--max-ply", "1", "--depth", "3", "--workers", "1", "--chunk-size", "10",
+                  "--work-dir", self.work_dir, "--output", self.output])
+
+        os.remove(os.path.join(self.work_dir, MANIFEST_NAME))
+        with self.assertRaises(ValueError):
+            prepare_work_dir(self.work_dir, {"max_ply": 1})
@@ -0,0 +1,101 @@
+"""
+Test module for the vectorized evaluation.
+"""
+
+import random
+import unittest
+import numpy as np
+from src.ai_player import AIPlayer
+from src.board import Board
+from src.evaluation import (
+    WINDOW_INDEX, evaluate_array, heuristic_value, evaluate_batch, bitboards_to_arrays,
+    evaluate_bitboards)
+
+
+def random_boards(seed, count):
+    """
+    Generate boards from random games of random length.
+
+    Args:
+        seed (int): The seed of the random games.
+        count (int): The number of boards to generate.
+
+    Returns:
+        list: The generated boards.
+    """
+    generator = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board()
+        for move in range(generator.randint(0, 42)):
+            columns = [col for col in range(7) if board.is_valid_location(col)]
+            board.play(generator.choice(columns), 1 + move % 2)
+        boards.append(board)
+    return boards
+
+
+class TestEvaluation(unittest.TestCase):
+    """
+    Test the vectorized evaluation against AIPlayer.heuristic_value.
+    """
+
+    def setUp(self):
+        self.ai_player = AIPlayer(player_id=2)
+
+    def test_window_index_shape(self):
+        """
+        Test that the window index covers all 69 windows of four distinct cells.
+        """
+        self.assertEqual(WINDOW_INDEX.shape, (69, 4))
+        self.assertEqual(len({tuple(sorted(window)) for window in WINDOW_INDEX.tolist()}), 69)
+
+    def test_empty_board(self):
+        """
+        Test that an empty board has a heuristic value of 0.
+        """
+        self.assertEqual(heuristic_value(Board()), 0)
+
+    def test_matches_heuristic_value_on_random_boards(self):
+        """
+        Test that the vectorized evaluation gives the same value as the Python loops.
+        """
+        for board in random_boards(7, 50):
+            self.assertEqual(heuristic_value(board), self.ai_player.heuristic_value(board))
+
+    def test_placeholder_chips(self):
+        """
+        Test that chips other than 1 and 2 block windows like in AIPlayer.heuristic_value.
+        """
+        board = Board()
+        board.board[5][0] = board.board[5][1] = board.board[5][2] = 2
+        board.board[5][3] = -1  # -1 is a placeholder for any chip
+        board.board[4][0] = board.board[3][0] = 1
+        self.assertEqual(evaluate_array(board.board), self.ai_player.heuristic_value(board))
+
+    def test_evaluate_batch(self):
+        """
+        Test that a batch of boards gets the same values as evaluating them one by one.
+        """
+        boards = random_boards(11, 30)
+        scores = evaluate_batch(np.stack([board.board for board in boards]))
+        self.assertEqual(scores.shape, (30,))
+        self.assertEqual(scores.tolist(), [heuristic_value(board) for board in boards])
+
+    def test_bitboards_to_arrays(self):
+        """
+        Test that unpacking the bitboards of a board gives back its array.
+        """
+        boards = random_boards(13, 10)
+        arrays = bitboards_to_arrays([board.bitboards[2] for board in boards],
+                                     [board.bitboards[1] for board in boards])
+        for board, array in zip(boards, arrays):
+            self.assertTrue((array == board.board).all())
+
+    def test_evaluate_bitboards(self):
+        """
+        Test that boards packed as bitboards get the same values as their arrays.
+        """
+        boards = random_boards(17, 20)
+        scores = evaluate_bitboards([board.bitboards[2] for board in boards],
+                                    [board.bitboards[1] for board in boards])
+        self.assertEqual(scores.tolist(), [heuristic_value(board) for board in boards])
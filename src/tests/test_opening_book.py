@@ -0,0 +1,88 @@
+"""
+Test module for the OpeningBook class.
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from src.ai_player import AIPlayer
+from src.board import Board, mirror_key
+from src.opening_book import OpeningBook, write_book
+
+
+class TestOpeningBook(unittest.TestCase):
+    """
+    Test the OpeningBook class and its methods in different scenarios.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "book.bin")
+        board = Board()
+        board.drop_chip(1, 1)
+        self.first_key = board.position_key()  # Player 1 opened in column 1
+        board.drop_chip(2, 2)
+        self.second_key = board.position_key()
+        records = sorted([(self.first_key, 2, 10), (self.second_key, 3, -20),
+                          (Board().position_key(), 3, 0)])
+        self.assertEqual(write_book(self.path, records, max_ply=2), 3)
+        self.book = OpeningBook(self.path)
+
+    def tearDown(self):
+        self.book.close()
+
+    def test_probe(self):
+        """
+        Test that the stored keys are found and others are not.
+        """
+        self.assertEqual(self.book.size, 3)
+        self.assertEqual(self.book.max_ply, 2)
+        self.assertEqual(self.book.probe(self.first_key), (2, 10))
+        self.assertEqual(self.book.probe(self.second_key), (3, -20))
+        self.assertIsNone(self.book.probe(self.first_key + 1))
+
+    def test_lookup_mirrored_position(self):
+        """
+        Test that a mirrored position is found and its move is mirrored too.
+        """
+        board = Board()
+        board.drop_chip(5, 1)
+        self.assertEqual(board.position_key(), mirror_key(self.first_key))
+        self.assertEqual(self.book.lookup(board), (4, 10))
+
+    def test_lookup_beyond_max_ply(self):
+        """
+        Test that positions deeper than the book are not looked up.
+        """
+        board = Board()
+        for column in (1, 2, 3):
+            board.drop_chip(column, 1)
+        self.assertIsNone(self.book.lookup(board))
+
+    def test_pickled_book_opens_same_file(self):
+        """
+        Test that a book sent to another process opens the same file there.
+        """
+        with pickle.loads(pickle.dumps(self.book)) as book:
+            self.assertEqual(book.path, self.path)
+            self.assertEqual(book.probe(self.first_key), (2, 10))
+
+    def test_unsorted_records_are_rejected(self):
+        """
+        Test that write_book refuses records that are not in ascending key order.
+        """
+        with self.assertRaises(ValueError):
+            write_book(os.path.join(self.directory, "unsorted.bin"),
+                       [(2, 0, 0), (1, 0, 0)], max_ply=1)
+
+    def test_ai_player_uses_book_move(self):
+        """
+        Test that the AI player answers a book position with the book move.
+        """
+        ai_player = AIPlayer(2, opening_book=self.book)
+        board = Board()
+        board.drop_chip(1, 1)
+        self.assertEqual(ai_player.get_best_move(board, 1), 2)
@@ -0,0 +1,145 @@
+"""
+Test module for the RootSearchPool class.
+"""
+
+import unittest
+from src.ai_player import AIPlayer
+from src.board import Board
+
+
+def sequential_scores(board, depth, total_moves):
+    """
+    Search every root move of a position in this process with a full window.
+    """
+    player = AIPlayer(2)
+    scores = {}
+    for column in range(board.column_count):
+        if board.is_valid_location(column):
+            last_row = board.play(column, 2)
+            scores[column] = player.minimax(
+                board, depth-1, float("-inf"), float("inf"), False, total_moves+1, last_row,
+                column)[1]
+            board.undo()
+    return scores
+
+
+class TestRootSearchPool(unittest.TestCase):
+    """
+    Test the RootSearchPool class and its methods in different scenarios.
+    """
+
+    def setUp(self):
+        self.board = Board()
+        for column, chip in [(3, 1), (3, 2), (4, 1), (2, 2), (4, 1)]:
+            self.board.play(column, chip)
+        self.expected = sequential_scores(self.board, 4, 5)
+        self.best_score = max(self.expected.values())
+
+    def assert_same_choice(self, scores):
+        """
+        Assert that the parallel scores lead to the same moves as a sequential search:
+        the best moves are scored exactly and the others no higher than the truth.
+        """
+        self.assertEqual(set(scores), set(self.expected))
+        for column, score in scores.items():
+            if self.expected[column] == self.best_score:
+                self.assertEqual(score, self.best_score)
+            else:
+                self.assertLess(score, self.best_score)
+                self.assertGreaterEqual(score, self.expected[column])
+
+    def test_root_moves_match_sequential_search(self):
+        """
+        Test that splitting the root moves across processes finds the same best moves.
+        """
+        player = AIPlayer(2, processes=2)
+        try:
+            self.assert_same_choice(player.search_pool.search(
+                self.board, [3, 2, 4, 1, 5, 0, 6], 4, 5, (0, 1)))
+            self.assertGreater(player.search_pool.node_count, 0)
+            # The pool is reused for the next search
+            self.assert_same_choice(player.search_pool.search(
+                self.board, [3, 2, 4, 1, 5, 0, 6], 4, 5, (0, 2)))
+        finally:
+            player.close()
+        self.assertIsNone(player.search_pool)
+
+    def test_split_replies_match_sequential_search(self):
+        """
+        Test that splitting the replies to the root moves finds the same best moves.
+        """
+        player = AIPlayer(2, processes=2, split_replies=True)
+        try:
+            self.assert_same_choice(player.search_pool.search(
+                self.board, [3, 2, 4, 1, 5, 0, 6], 4, 5, (0, 1)))
+        finally:
+            player.close()
+
+    def test_search_leaves_board_unchanged(self):
+        """
+        Test that preparing the tasks does not change the board.
+        """
+        player = AIPlayer(2, processes=1, split_replies=True)
+        expected_board = self.board.board.copy()
+        try:
+            player.search_pool.search(self.board, [3, 2, 4, 1, 5, 0, 6], 2, 5, (0, 1))
+        finally:
+            player.close()
+        self.assertTrue((self.board.board == expected_board).all())
+        self.assertEqual(self.board.history, [3, 3, 4, 2, 4])
+
+
+class TestLazySMPPool(unittest.TestCase):
+    """
+    Test the LazySMPPool class and the lazy SMP mode of AIPlayer.
+    """
+
+    def setUp(self):
+        self.player = AIPlayer(2, threads=2, table_size=2 ** 12)
+        self.board = Board()
+        for column, chip in [(3, 1), (3, 2), (4, 1)]:
+            self.board.play(column, chip)
+
+    def tearDown(self):
+        self.player.close()
+
+    def test_helpers_fill_shared_table(self):
+        """
+        Test that the entries stored by a helper process are seen by the main process.
+        """
+        table = self.player.transposition_table
+        self.player.smp_pool.start(self.board, 3, 3, table.generation)
+        self.player.smp_pool.wait()
+        # The helper searched every root move, so the positions after them are stored
+        for column in range(self.board.column_count):
+            self.board.play(column, 2)
+            self.assertIsNotNone(table.probe(self.board.zobrist_hash))
+            self.board.undo()
+
+    def test_stop_ends_helper_searches(self):
+        """
+        Test that the helpers give up a search when the main search is over, even one
+        without a deadline.
+        """
+        table = self.player.transposition_table
+        self.player.smp_pool.start(self.board, 30, 3, table.generation)
+        running = self.player.smp_pool.running
+        self.player.smp_pool.stop()
+        for result in running:
+            result.get(timeout=30)
+        self.assertEqual(self.player.smp_pool.running, [])
+
+    def test_blocks_with_helpers(self):
+        """
+        Test that the AI blocks an open three while helpers share the search.
+        """
+        self.board.play(6, 2)
+        self.board.play(2, 1)
+        self.assertIn(self.player.get_best_move(self.board, 5), (1, 5))
+
+    def test_processes_and_threads_are_exclusive(self):
+        """
+        Test that the root-parallel and lazy SMP modes can not be combined.
+        """
+        with self.assertRaises(ValueError):
+            AIPlayer(2, processes=2, threads=2)
@@ -0,0 +1,53 @@
+"""
+Test module for move profiling and the profile summary.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src.ai_player import AIPlayer, PROFILE_DIR_VARIABLE
+from src.board import Board
+from src.profile_summary import summarize
+
+
+class TestProfileSummary(unittest.TestCase):
+    """
+    Test profiling moves and summarizing the profiles in different scenarios.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.profile_dir = os.path.join(self.directory, "profiles")
+        self.board = Board()
+        self.board.play(3, 1)
+
+    def test_move_is_profiled(self):
+        """
+        Test that a profile named after the move and position is written, and that the
+        summary ranks the search functions.
+        """
+        player = AIPlayer(2, profile_dir=self.profile_dir)
+        self.assertIn(player.get_best_move(self.board, 1, max_depth=4), range(7))
+        expected = f"move_01_{self.board.position_key():013x}.prof"
+        self.assertEqual(os.listdir(self.profile_dir), [expected])
+
+        rows = summarize([os.path.join(self.profile_dir, expected)], limit=5)
+        self.assertEqual([row[0] for row in rows[:5]], [1, 2, 3, 4, 5])
+        self.assertTrue(any("(minimax)" in row[1] for row in rows))
+        own_times = [row[3] for row in rows[:5]]
+        self.assertEqual(own_times, sorted(own_times, reverse=True))
+
+    def test_profiling_is_off_by_default(self):
+        """
+        Test that moves are profiled only when asked to, and that the environment
+        variable switches profiling on.
+        """
+        with mock.patch.dict(os.environ, {PROFILE_DIR_VARIABLE: ""}):
+            AIPlayer(2).get_best_move(self.board, 1, max_depth=2)
+        self.assertFalse(os.path.exists(self.profile_dir))
+        with mock.patch.dict(os.environ, {PROFILE_DIR_VARIABLE: self.profile_dir}):
+            AIPlayer(2).get_best_move(self.board, 1, max_depth=2)
+        self.assertEqual(len(os.listdir(self.profile_dir)), 1)
@@ -0,0 +1,101 @@
+"""
+Test module for the Solver class.
+"""
+
+import random
+import unittest
+from src.board import Board
+from src.solver import Solver
+
+
+def random_endgame(generator, chips):
+    """
+    Play a random game until the given number of chips, starting over if someone wins.
+
+    Args:
+        generator (random.Random): The random number generator.
+        chips (int): The number of chips on the board.
+
+    Returns:
+        Board: A board with the given number of chips and no winner.
+    """
+    while True:
+        board = Board()
+        for move in range(chips):
+            columns = [col for col in range(7) if board.is_valid_location(col)]
+            column = generator.choice(columns)
+            last_row = board.play(column, 1 + move % 2)
+            if board.is_winner(last_row, column, 1 + move % 2):
+                break
+        else:
+            return board
+
+
+def brute_force_score(board, chip):
+    """
+    Score a position by searching every move to the end of the game.
+
+    Args:
+        board (Board): The board to score.
+        chip (int): The chip of the player to move.
+
+    Returns:
+        int: The score of the position in the scale of the solver.
+    """
+    best_score = None
+    for column in range(7):
+        if not board.is_valid_location(column):
+            continue
+        last_row = board.play(column, chip)
+        if board.is_winner(last_row, column, chip):
+            score = (board.empty_cell_count() + 2) // 2
+        elif board.empty_cell_count() == 0:
+            score = 0
+        else:
+            score = -brute_force_score(board, 3 - chip)
+        board.undo()
+        if best_score is None or score > best_score:
+            best_score = score
+    return best_score
+
+
+class TestSolver(unittest.TestCase):
+    """
+    Test the Solver class and its methods in different scenarios.
+    """
+
+    def setUp(self):
+        self.solver = Solver()
+
+    def test_matches_brute_force(self):
+        """
+        Test that the solver proves the same scores as a full search on small endgames.
+        """
+        generator = random.Random(3)
+        for game in range(30):
+            board = random_endgame(generator, 32 + game % 3)
+            chip = 1 + (32 + game % 3) % 2
+            best_move, score, node_count = self.solver.solve_board(board, chip)
+            self.assertEqual(score, brute_force_score(board, chip))
+            self.assertTrue(board.is_valid_location(best_move))
+            self.assertGreater(node_count, 0)
+
+    def test_immediate_win(self):
+        """
+        Test that a win with the next chip is found and scored by its distance.
+        """
+        board = Board()
+        for _ in range(3):
+            board.drop_chip(2, 2)
+            board.drop_chip(4, 1)
+        self.assertEqual(self.solver.solve_board(board, 2), (2, 18, 1))
+
+    def test_full_board(self):
+        """
+        Test that a full board has no move to solve.
+        """
+        board = Board()
+        for _ in range(6):
+            for column in range(7):
+                board.drop_chip(column, -1)  # -1 is a placeholder for any chip
+        self.assertEqual(self.solver.solve_board(board, 2), (None, None, 0))
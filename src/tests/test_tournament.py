@@ -0,0 +1,72 @@
+"""
+Test module for the self-play tournament.
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from src.board import Board
+from src.tournament import random_opening, search_limits, make_tasks, main
+
+
+class TestTournament(unittest.TestCase):
+    """
+    Test the self-play tournament in different scenarios.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.output = os.path.join(self.directory, "results.jsonl")
+
+    def test_random_opening_has_no_winner(self):
+        """
+        Test that random openings are legal and nobody has won in them yet.
+        """
+        rng = random.Random(1)
+        for _ in range(50):
+            opening = random_opening(rng, 8)
+            board = Board()
+            self.assertEqual(len(opening), 8)
+            for ply, column in enumerate(opening):
+                chip = 1 + ply % 2
+                self.assertTrue(board.is_valid_location(column))
+                self.assertFalse(board.is_winner(board.play(column, chip), column, chip))
+
+    def test_openings_are_played_with_both_colors(self):
+        """
+        Test that every opening is played twice with side A playing both chips.
+        """
+        tasks = make_tasks(4, 2, {}, seed=3)
+        self.assertEqual(tasks[0][1], tasks[1][1])
+        self.assertEqual([task[2] for task in tasks], [1, 2, 1, 2])
+        self.assertEqual([task[0] for task in make_tasks(3, 2, {}, seed=3)], [0, 1, 2])
+        self.assertEqual(search_limits(0.1, 500), {"node_budget": 500})
+        self.assertEqual(search_limits(0.1), {"time_limit": 0.1})
+
+    def test_tournament_writes_results(self):
+        """
+        Test that the tournament writes a result with the stats of every move.
+        """
+        main(["--games", "2", "--depth-a", "2", "--nodes-b", "300", "--workers", "2",
+              "--table-size", "1024", "--seed", "5", "--output", self.output])
+        with open(self.output, encoding="utf-8") as file:
+            records = sorted((json.loads(line) for line in file), key=lambda r: r["game"])
+        self.assertEqual([record["game"] for record in records], [0, 1])
+        for record in records:
+            self.assertIn(record["result"], ("win", "draw", "loss"))
+            self.assertEqual(record["length"], 4 + len(record["moves"]))
+            board = Board()
+            columns = record["opening"] + [move["column"] for move in record["moves"]]
+            for ply, column in enumerate(columns):
+                self.assertTrue(board.is_valid_location(column))
+                board.play(column, 1 + ply % 2)
+            first_side = "a" if record["a_chip"] == 1 else "b"
+            self.assertEqual(record["moves"][0]["side"], first_side)
+            for move in record["moves"]:
+                self.assertGreaterEqual(move["nodes"], 0)
+                self.assertIn("depth", move)
+                self.assertIn("time", move)
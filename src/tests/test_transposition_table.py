@@ -0,0 +1,129 @@
+"""
+Test module for the TranspositionTable class.
+"""
+
+import pickle
+import unittest
+from src.transposition_table import (
+    TranspositionTable, SharedTranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND)
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """
+    Test the TranspositionTable class and its methods in different scenarios.
+    """
+
+    def setUp(self):
+        self.table = TranspositionTable(size=8)
+
+    def test_size_is_rounded_to_power_of_two(self):
+        """
+        Test that the table size is rounded up to the next power of two.
+        """
+        self.assertEqual(TranspositionTable(size=100).size, 128)
+        self.assertEqual(len(TranspositionTable(size=100).entries), 128)
+
+    def test_store_and_probe(self):
+        """
+        Test that a stored entry is returned for the same key.
+        """
+        self.table.store(12345, 100, 4, EXACT, 3)
+        self.assertEqual(self.table.probe(12345), (100, 4, EXACT, 3))
+
+    def test_probe_missing_key(self):
+        """
+        Test that probing an unknown key returns None, also when its slot is taken.
+        """
+        self.assertIsNone(self.table.probe(1))
+        self.table.store(1, 10, 2, EXACT, 0)
+        self.assertIsNone(self.table.probe(1 + self.table.size))
+
+    def test_deeper_entry_is_not_replaced_by_shallower(self):
+        """
+        Test that a colliding shallower entry does not replace a deeper entry.
+        """
+        self.table.store(1, 10, 5, EXACT, 0)
+        self.table.store(1 + self.table.size, 20, 2, LOWER_BOUND, 1)
+        self.assertEqual(self.table.probe(1), (10, 5, EXACT, 0))
+        self.assertIsNone(self.table.probe(1 + self.table.size))
+
+    def test_same_key_is_replaced(self):
+        """
+        Test that a new result for the same position replaces the old one.
+        """
+        self.table.store(1, 10, 5, EXACT, 0)
+        self.table.store(1, 20, 2, LOWER_BOUND, 1)
+        self.assertEqual(self.table.probe(1), (20, 2, LOWER_BOUND, 1))
+
+    def test_clear(self):
+        """
+        Test that clear removes all entries.
+        """
+        self.table.store(1, 10, 5, EXACT, 0)
+        self.table.clear()
+        self.assertIsNone(self.table.probe(1))
+
+    def test_entries_survive_new_search(self):
+        """
+        Test that entries stored by an earlier search can still be probed.
+        """
+        self.table.store(1, 10, 5, EXACT, 0)
+        self.table.new_search()
+        self.assertEqual(self.table.probe(1), (10, 5, EXACT, 0))
+
+    def test_older_generation_is_replaced_first(self):
+        """
+        Test that a deep entry from an older search is replaced by a shallower new one.
+        """
+        self.table.store(1, 10, 5, EXACT, 0)
+        self.table.new_search()
+        self.table.store(1 + self.table.size, 20, 2, LOWER_BOUND, 1)
+        self.assertIsNone(self.table.probe(1))
+        self.assertEqual(self.table.probe(1 + self.table.size), (20, 2, LOWER_BOUND, 1))
+
+
+class TestSharedTranspositionTable(TestTranspositionTable):
+    """
+    Test the SharedTranspositionTable class with the same scenarios as the
+    TranspositionTable class, and the ones specific to shared memory.
+    """
+
+    def setUp(self):
+        self.table = SharedTranspositionTable(size=8)
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_packed_values(self):
+        """
+        Test that negative scores, missing best moves and full 64-bit keys survive packing.
+        """
+        key = 0xFEDCBA9876543210
+        self.table.store(key, -3042, 41, UPPER_BOUND, None)
+        self.assertEqual(self.table.probe(key), (-3042, 41, UPPER_BOUND, None))
+        self.table.store(key, float("inf"), 3, LOWER_BOUND, 6)
+        self.assertEqual(self.table.probe(key)[1:], (3, LOWER_BOUND, 6))
+
+    def test_torn_entry_reads_as_empty(self):
+        """
+        Test that a slot whose words come from two different stores is not returned.
+        """
+        self.table.store(1, 10, 5, EXACT, 0)
+        other = SharedTranspositionTable(size=8)
+        try:
+            other.store(1, 20, 2, LOWER_BOUND, 1)
+            self.table.slots[3] = other.slots[3]  # Only the packed entry is overwritten
+        finally:
+            other.close()
+        self.assertIsNone(self.table.probe(1))
+
+    def test_attached_table_shares_entries(self):
+        """
+        Test that a table attached to the same shared memory sees the stored entries.
+        """
+        attached = pickle.loads(pickle.dumps(self.table))
+        try:
+            attached.store(5, 30, 4, EXACT, 2)
+            self.assertEqual(self.table.probe(5), (30, 4, EXACT, 2))
+        finally:
+            attached.close()
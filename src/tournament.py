@@ -0,0 +1,221 @@
+"""
+Connect Four Self-Play Tournament
+
+Plays games between two AI players, side A and side B, in a pool of worker processes
+and streams the results to a JSONL file, one game per line. Every game starts from a
+random opening, and each opening is played twice with the sides swapping colors, so
+neither side profits from a lucky opening. Each side searches with its own time limit,
+node budget or fixed depth.
+
+Usage: python -m src.tournament --games 1000 --time-a 0.1 --nodes-b 20000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+from .board import Board
+from .ai_player import AIPlayer
+from .transposition_table import DEFAULT_TABLE_SIZE
+
+SIDES = ("a", "b")
+
+_worker_players = None  # AI players of a worker process by side
+
+
+def random_opening(rng, plies):
+    """
+    Play random moves from the empty board. Openings where a player has already won
+    are thrown away and drawn again.
+
+    Args:
+        rng (random.Random): The random number generator.
+        plies (int): The number of moves in the opening.
+
+    Returns:
+        list: The columns played, with player 1 starting.
+    """
+    while True:
+        board = Board()
+        moves = []
+        for ply in range(plies):
+            chip = 1 + ply % 2
+            column = rng.choice(
+                [column for column in range(board.column_count)
+                 if board.is_valid_location(column)])
+            last_row = board.play(column, chip)
+            moves.append(column)
+            if board.is_winner(last_row, column, chip):
+                break
+        else:
+            return moves
+
+
+def search_limits(time_limit=None, node_budget=None, max_depth=None):
+    """
+    Get the keyword arguments of `AIPlayer.get_best_move` for the budget of a side.
+    A node budget is used before a fixed depth, and a fixed depth before a time limit.
+
+    Args:
+        time_limit (float, optional): The time in seconds per move. Defaults to None.
+        node_budget (int, optional): The number of nodes per move. Defaults to None.
+        max_depth (int, optional): The search depth per move. Defaults to None.
+
+    Returns:
+        dict: The search limits of the side.
+    """
+    if node_budget:
+        return {"node_budget": node_budget}
+    if max_depth:
+        return {"max_depth": max_depth, "start_depth": min(max_depth, 3)}
+    if time_limit:
+        return {"time_limit": time_limit}
+    return {}
+
+
+def _init_worker(table_size):
+    global _worker_players  # pylint: disable=global-statement
+    # The AI always plays chip 2, so every side searches with the same player id
+    _worker_players = {side: AIPlayer(2, table_size=table_size) for side in SIDES}
+
+
+def play_game(task):
+    """
+    Play one game between the sides in a worker process.
+
+    The AI players search as player 2, so the side playing player 1 searches a copy of
+    the board with the chips of the players swapped.
+
+    Args:
+        task (tuple): The game number, the columns of the opening, the chip of side A
+        and the search limits of both sides by side.
+
+    Returns:
+        dict: The game number, the opening, the chip of side A, the result for side A
+        ("win", "draw" or "loss"), the number of moves in the game and the column,
+        completed depth, node count and time of every searched move.
+    """
+    game, opening, a_chip, limits = task
+    boards = {2: Board(), 1: Board()}  # Board as seen by the player of each chip
+    sides = {a_chip: "a", 3 - a_chip: "b"}
+    for player in _worker_players.values():
+        player.new_game()
+
+    def play(column, chip):
+        boards[1].play(column, 3 - chip)
+        return boards[2].play(column, chip)
+
+    for ply, column in enumerate(opening):
+        play(column, 1 + ply % 2)
+    total_moves = len(opening)
+    winner = None
+    moves = []
+    while winner is None and total_moves < boards[2].row_count * boards[2].column_count:
+        chip = 1 + total_moves % 2
+        side = sides[chip]
+        player = _worker_players[side]
+        column = player.get_best_move(boards[chip], total_moves, **limits[side])
+        result = player.last_result
+        moves.append({"side": side, "column": column, "depth": result.depth,
+                      "nodes": result.nodes, "time": round(result.elapsed, 6)})
+        last_row = play(column, chip)
+        total_moves += 1
+        if boards[2].is_winner(last_row, column, chip):
+            winner = side
+
+    outcome = "draw" if winner is None else ("win" if winner == "a" else "loss")
+    return {"game": game, "opening": opening, "a_chip": a_chip, "result": outcome,
+            "length": total_moves, "moves": moves}
+
+
+def make_tasks(games, opening_plies, limits, seed=None):
+    """
+    Make the tasks of a tournament. Games are made in pairs that play the same random
+    opening with side A playing first in one game and second in the other.
+
+    Args:
+        games (int): The number of games.
+        opening_plies (int): The number of random moves in each opening.
+        limits (dict): The search limits of both sides by side.
+        seed (int, optional): The seed of the random openings. Defaults to None.
+
+    Returns:
+        list: The tasks for `play_game`.
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for pair in range(0, games, 2):
+        opening = random_opening(rng, opening_plies)
+        tasks.append((pair, opening, 1, limits))
+        if pair + 1 < games:
+            tasks.append((pair + 1, opening, 2, limits))
+    return tasks
+
+
+def run_tournament(tasks, output, workers, table_size):
+    """
+    Play the games in a process pool and write each result to the output file as soon
+    as it is finished.
+
+    Args:
+        tasks (list): The tasks for `play_game`.
+        output (str): The path of the JSONL results file.
+        workers (int): The number of worker processes.
+        table_size (int): The number of transposition table slots of every player.
+
+    Returns:
+        dict: The number of wins, draws and losses of side A.
+    """
+    totals = {"win": 0, "draw": 0, "loss": 0}
+    with open(output, "w", encoding="utf-8") as file, multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(table_size,)) as pool:
+        for record in pool.imap_unordered(play_game, tasks):
+            file.write(json.dumps(record) + "\n")
+            file.flush()
+            totals[record["result"]] += 1
+    return totals
+
+
+def main(argv=None):
+    """
+    Play a self-play tournament from the command line.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Play a Connect Four self-play tournament.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games")
+    for side in SIDES:
+        name = side.upper()
+        parser.add_argument(f"--time-{side}", type=float, default=0.1,
+                            help=f"seconds per move of side {name}")
+        parser.add_argument(f"--nodes-{side}", type=int,
+                            help=f"node budget per move of side {name}, instead of time")
+        parser.add_argument(f"--depth-{side}", type=int,
+                            help=f"search depth per move of side {name}, instead of time")
+    parser.add_argument("--opening-plies", type=int, default=4,
+                        help="number of random moves in each opening")
+    parser.add_argument("--seed", type=int, help="seed of the random openings")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("--table-size", type=int, default=DEFAULT_TABLE_SIZE,
+                        help="number of transposition table slots of every player")
+    parser.add_argument("--output", default="tournament.jsonl", help="JSONL results file")
+    args = parser.parse_args(argv)
+
+    options = vars(args)
+    limits = {
+        side: search_limits(options[f"time_{side}"], options[f"nodes_{side}"],
+                            options[f"depth_{side}"])
+        for side in SIDES
+    }
+    tasks = make_tasks(args.games, args.opening_plies, limits, args.seed)
+    totals = run_tournament(tasks, args.output, args.workers, args.table_size)
+    score = (totals["win"] + totals["draw"] / 2) / max(1, args.games)
+    print(f"Side A: {totals['win']} wins, {totals['draw']} draws, {totals['loss']} losses "
+          f"({score:.1%}). Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
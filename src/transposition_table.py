@@ -0,0 +1,197 @@
+"""
+Connect Four Transposition Table Module
+"""
+
+from multiprocessing import shared_memory
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+DEFAULT_TABLE_SIZE = 2 ** 18
+
+
+class TranspositionTable:
+    """
+    Represents a fixed-capacity transposition table for the minimax search.
+
+    Entries are addressed by the Zobrist hash of a position. Each slot holds one entry,
+    so the table never grows beyond its capacity. The table is kept between searches
+    and every entry is tagged with the generation (search) that stored it. A new entry
+    replaces an entry of another position if that entry is from an older generation
+    or was searched at most as deep.
+    """
+
+    def __init__(self, size=DEFAULT_TABLE_SIZE):
+        """
+        Initialize an empty transposition table.
+
+        Args:
+            size (int): The number of slots in the table, rounded up to a power of two.
+        """
+        self.size = 1 << max(0, size - 1).bit_length()
+        self.index_mask = self.size - 1
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def clear(self):
+        """
+        Remove all entries from the table.
+        """
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def new_search(self):
+        """
+        Start a new generation, making the entries stored so far the first to be replaced.
+        """
+        self.generation += 1
+
+    def probe(self, key):
+        """
+        Look up the entry stored for a position.
+
+        Args:
+            key (int): The Zobrist hash of the position.
+
+        Returns:
+            tuple: A tuple (score, depth, flag, best_move) if the position is stored.
+            Otherwise, None.
+        """
+        entry = self.entries[key & self.index_mask]
+        if entry is not None and entry[0] == key:
+            return entry[1:5]
+        return None
+
+    def store(self, key, score, depth, flag, best_move):
+        """
+        Store the search result of a position.
+
+        Args:
+            key (int): The Zobrist hash of the position.
+            score (int): The minimax score of the position.
+            depth (int): The remaining search depth the score was computed with.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND depending on how the score
+            relates to the alpha-beta window of the search.
+            best_move (int): The best column found for the position, or None.
+        """
+        index = key & self.index_mask
+        entry = self.entries[index]
+        if entry is None or entry[0] == key or entry[5] != self.generation \
+                or depth >= entry[2]:
+            self.entries[index] = (key, score, depth, flag, best_move, self.generation)
+
+
+# Bit layout of a packed entry of the shared table, from the lowest bits up: a bit that
+# marks the slot used, the best move plus one (0 for None), the flag, the depth, the
+# generation and the score offset to be non-negative
+MOVE_SHIFT = 1
+FLAG_SHIFT = 4
+DEPTH_SHIFT = 6
+GENERATION_SHIFT = 14
+SCORE_SHIFT = 22
+SCORE_OFFSET = 1 << 31
+SCORE_LIMIT = SCORE_OFFSET - 1
+
+
+class SharedTranspositionTable:
+    """
+    Represents a transposition table in shared memory that several processes search
+    with at the same time.
+
+    The table is a flat array of 64-bit words, two per slot: the packed entry and the
+    key of the position XORed with the packed entry. Processes read and write the words
+    without locks. A slot whose two words were written by different stores fails the
+    key check on probe and reads as empty. Otherwise the table works like
+    `TranspositionTable`, with generations counted modulo 256.
+    """
+
+    def __init__(self, size=DEFAULT_TABLE_SIZE, name=None):
+        """
+        Create a table in shared memory, or attach to an existing one.
+
+        Args:
+            size (int): The number of slots in the table, rounded up to a power of two.
+            name (str, optional): The name of the shared memory block to attach to.
+            Defaults to None, which creates a new block.
+        """
+        self.size = 1 << max(0, size - 1).bit_length()
+        self.index_mask = self.size - 1
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=self.size * 16)
+            self.memory.buf[:self.size * 16] = bytes(self.size * 16)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.slots = self.memory.buf.cast("Q")
+        self.generation = 0
+
+    def __reduce__(self):
+        return SharedTranspositionTable, (self.size, self.memory.name)
+
+    def clear(self):
+        """
+        Remove all entries from the table.
+        """
+        self.memory.buf[:self.size * 16] = bytes(self.size * 16)
+        self.generation = 0
+
+    def new_search(self):
+        """
+        Start a new generation, making the entries stored so far the first to be replaced.
+        """
+        self.generation += 1
+
+    def probe(self, key):
+        """
+        Look up the entry stored for a position.
+
+        Args:
+            key (int): The Zobrist hash of the position.
+
+        Returns:
+            tuple: A tuple (score, depth, flag, best_move) if the position is stored.
+            Otherwise, None.
+        """
+        index = (key & self.index_mask) << 1
+        data = self.slots[index + 1]
+        if not data or self.slots[index] ^ data != key:
+            return None
+        move = (data >> MOVE_SHIFT) & 0x7
+        return ((data >> SCORE_SHIFT) - SCORE_OFFSET, (data >> DEPTH_SHIFT) & 0xFF,
+                (data >> FLAG_SHIFT) & 0x3, move - 1 if move else None)
+
+    def store(self, key, score, depth, flag, best_move):
+        """
+        Store the search result of a position.
+
+        Args:
+            key (int): The Zobrist hash of the position.
+            score (int): The minimax score of the position.
+            depth (int): The remaining search depth the score was computed with.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND depending on how the score
+            relates to the alpha-beta window of the search.
+            best_move (int): The best column found for the position, or None.
+        """
+        index = (key & self.index_mask) << 1
+        data = self.slots[index + 1]
+        generation = self.generation & 0xFF
+        if data and self.slots[index] ^ data != key \
+                and (data >> GENERATION_SHIFT) & 0xFF == generation \
+                and depth < (data >> DEPTH_SHIFT) & 0xFF:
+            return
+        score = int(max(-SCORE_LIMIT, min(SCORE_LIMIT, score)))
+        data = (1 | (0 if best_move is None else best_move + 1) << MOVE_SHIFT
+                | flag << FLAG_SHIFT | depth << DEPTH_SHIFT
+                | generation << GENERATION_SHIFT | (score + SCORE_OFFSET) << SCORE_SHIFT)
+        self.slots[index] = key ^ data
+        self.slots[index + 1] = data
+
+    def close(self):
+        """
+        Detach from the shared memory, and free it if this table created it.
+        """
+        self.slots.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
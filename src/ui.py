@@ -2,6 +2,7 @@
 Connect Four User Interface Module
 """
 
+import numpy as np
 import pygame
 
 BLACK = (0, 0, 0)
@@ -10,6 +11,9 @@ WHITE = (255, 255, 255)
 YELLOW = (255, 255, 0)
 BLUE = (0, 0, 255)
 FONT_SIZE = 30
+GRID_SIZE = 100
+CHIP_RADIUS = GRID_SIZE // 2 - 5
+CHIP_COLORS = {1: RED, 2: YELLOW}
 
 
 def init_ui():
@@ -39,6 +43,135 @@ def draw_text(window, text, color, x, y, game_font):
     window.blit(text_surface, (x, y))
 
 
+class BoardRenderer:
+    """
+    Represents the drawing of the game board on a window.
+
+    The grid is rendered once to a cached surface and the chips are blitted from
+    pre-rendered sprites. The renderer remembers what it has drawn, so after the first
+    frame it redraws only the cells that changed and the row of the hovering chip, and
+    updates only those parts of the display.
+    """
+
+    def __init__(self):
+        """
+        Initialize a renderer that has not drawn anything yet.
+        """
+        self.grid = None
+        self.sprites = None
+        self.cells = None  # The chips drawn, or None if the window has to be redrawn
+        self.hover = None  # The column and chip color of the hovering chip drawn
+        self.message = None  # The message and its color drawn
+
+    def invalidate(self):
+        """
+        Make the next draw redraw the whole window, e.g. after something else was drawn
+        on it.
+        """
+        self.cells = None
+
+    def render_sprites(self, board):
+        """
+        Render the grid surface and the chip sprites.
+
+        Args:
+            board (Board): The game board to render the grid of.
+        """
+        self.grid = pygame.Surface(
+            (board.column_count * GRID_SIZE, board.row_count * GRID_SIZE)).convert()
+        self.grid.fill(BLUE)
+        for row in range(board.row_count):
+            for col in range(board.column_count):
+                pygame.draw.circle(self.grid, BLACK, (col * GRID_SIZE + GRID_SIZE // 2,
+                                   row * GRID_SIZE + GRID_SIZE // 2), CHIP_RADIUS)
+        self.sprites = {}
+        for color in (RED, YELLOW):
+            sprite = pygame.Surface(
+                (GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)  # pylint: disable=no-member
+            pygame.draw.circle(sprite, color, (GRID_SIZE // 2, GRID_SIZE // 2), CHIP_RADIUS)
+            self.sprites[color] = sprite.convert_alpha()
+
+    def draw_cell(self, window, board, row, col):
+        """
+        Draw one cell of the grid with its chip, if there is one.
+
+        Args:
+            window (pygame.Surface): The window to draw the cell on.
+            board (Board): The game board to draw.
+            row (int): The row index of the cell.
+            col (int): The column index of the cell.
+
+        Returns:
+            pygame.Rect: The area of the window that was drawn.
+        """
+        area = pygame.Rect(col * GRID_SIZE, row * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+        position = (col * GRID_SIZE, (row + 1) * GRID_SIZE)
+        window.blit(self.grid, position, area)
+        color = CHIP_COLORS.get(board.board[row][col])
+        if color is not None:
+            window.blit(self.sprites[color], position)
+        return area.move(0, GRID_SIZE)
+
+    def draw(self, window, board, show_message=None, message_color=WHITE, game_font=None,
+             current_column=None, current_player=None):
+        """
+        Draw the game board on the window, redrawing only what changed since the
+        previous draw.
+
+        Args:
+            window (pygame.Surface): The window to draw the game board on.
+            board (Board): The game board to draw.
+            show_message (str, optional): The message to display on the window.
+            message_color (tuple, optional): The color of the message text.
+            game_font (pygame.font.Font, optional): The font to use for rendering the
+            message.
+            current_column (int, optional): The column of the hovering chip.
+            current_player (Player, optional): The player whose chip is hovering.
+        """
+        if self.grid is None:
+            self.render_sprites(board)
+        hover = None
+        if current_column is not None and current_player is not None and show_message is None:
+            hover = (current_column, RED if current_player.get_id() == 1 else YELLOW)
+        message = (show_message, message_color) if show_message else None
+
+        if self.cells is None or message != self.message:
+            # Draw everything, the message covers parts of the hover row and the grid
+            window.fill(BLACK)
+            window.blit(self.grid, (0, GRID_SIZE))
+            for row in range(board.row_count):
+                for col in range(board.column_count):
+                    color = CHIP_COLORS.get(board.board[row][col])
+                    if color is not None:
+                        window.blit(self.sprites[color],
+                                    (col * GRID_SIZE, (row + 1) * GRID_SIZE))
+            if hover is not None:
+                window.blit(self.sprites[hover[1]], (hover[0] * GRID_SIZE, 0))
+            if show_message:
+                draw_text(window, show_message, message_color,
+                          window.get_width() // 4, window.get_height() // 12, game_font)
+            pygame.display.update()
+            dirty = None
+        else:
+            dirty = [self.draw_cell(window, board, row, col)
+                     for row, col in zip(*np.nonzero(board.board != self.cells))]
+            if hover != self.hover:
+                hover_row = pygame.Rect(0, 0, window.get_width(), GRID_SIZE)
+                window.fill(BLACK, hover_row)
+                if hover is not None:
+                    window.blit(self.sprites[hover[1]], (hover[0] * GRID_SIZE, 0))
+                dirty.append(hover_row)
+            if dirty:
+                pygame.display.update(dirty)
+
+        self.cells = board.board.copy()
+        self.hover = hover
+        self.message = message
+
+
+_renderer = BoardRenderer()
+
+
 def draw_board(window, board, show_message=None, message_color=WHITE, game_font=None,
                current_column=None, current_player=None):
     """
@@ -51,32 +184,16 @@ def draw_board(window, board, show_message=None, message_color=WHITE, game_font=
         game_font (pygame.font.Font, optional): The font to use for rendering the message. 
         Defaults to None.
     """
-    GRID_SIZE = 100
-    CHIP_RADIUS = GRID_SIZE // 2 - 5
-    window.fill(BLACK)  # Clear the window first
-
-    if current_column is not None and current_player is not None and show_message is None:
-        pygame.draw.circle(window, RED if current_player.get_id() == 1 else YELLOW,
-                           (current_column * 100 + 50, 50), 45)
-
-    for row in range(board.row_count - 1, -1, -1):
-        for col in range(board.column_count):
-            pygame.draw.rect(window, BLUE, (col * GRID_SIZE,
-                             (row + 1) * GRID_SIZE, GRID_SIZE, GRID_SIZE))
-            pygame.draw.circle(window, BLACK, (col * GRID_SIZE + GRID_SIZE //
-                               2, (row + 1) * GRID_SIZE + GRID_SIZE // 2), CHIP_RADIUS)
-            if board.board[row][col] == 1:
-                pygame.draw.circle(window, RED, (col * GRID_SIZE + GRID_SIZE //
-                                   2, (row + 1) * GRID_SIZE + GRID_SIZE // 2), CHIP_RADIUS)
-            elif board.board[row][col] == 2:
-                pygame.draw.circle(window, YELLOW, (col * GRID_SIZE + GRID_SIZE //
-                                   2, (row + 1) * GRID_SIZE + GRID_SIZE // 2), CHIP_RADIUS)
-
-    if show_message:
-        draw_text(window, show_message, message_color,
-                  window.get_width() // 4, window.get_height() // 12, game_font)
-
-    pygame.display.update()  # Update the display to show the changes
+    _renderer.draw(window, board, show_message, message_color, game_font, current_column,
+                   current_player)
+
+
+def invalidate_board():
+    """
+    Make the next draw_board call draw the whole window again, e.g. after the window
+    was uncovered.
+    """
+    _renderer.invalidate()
 
 
 def draw_start_menu(window, game_font):
@@ -87,6 +204,7 @@ def draw_start_menu(window, game_font):
         window (pygame.Surface): The window to draw the start menu on.
         game_font (pygame.font.Font): The font to use for rendering the start menu.
     """
+    _renderer.invalidate()  # The menu is drawn over the board
     window.fill(BLACK)
     draw_text(window, "Connect Four", WHITE, window.get_width() //
               3, window.get_height() // 4, game_font)
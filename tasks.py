@@ -2,7 +2,27 @@ from invoke import task
 
 @task
 def start(ctx, pty=True):
-    ctx.run("python3 src/connect_four.py", pty=pty)
+    ctx.run("python3 -m src.connect_four", pty=pty)
+
+@task
+def book(ctx, max_ply=5, depth=9):
+    ctx.run(f"python3 -m src.book_generator --max-ply {max_ply} --depth {depth}", pty=True)
+
+@task
+def tournament(ctx, games=1000, time_a=0.1, time_b=0.1, nodes_a=0, nodes_b=0,
+               opening_plies=4, output="tournament.jsonl"):
+    budgets = f"--time-a {time_a} --time-b {time_b}"
+    if nodes_a:
+        budgets += f" --nodes-a {nodes_a}"
+    if nodes_b:
+        budgets += f" --nodes-b {nodes_b}"
+    ctx.run(f"python3 -m src.tournament --games {games} {budgets} "
+            f"--opening-plies {opening_plies} --output {output}", pty=True)
+
+@task
+def benchmark(ctx, depth=8, output="benchmark.json", compare=""):
+    options = f"--compare {compare}" if compare else f"--output {output}"
+    ctx.run(f"python3 -m src.benchmark --depth {depth} {options}", pty=True)
 
 @task
 def test(ctx):